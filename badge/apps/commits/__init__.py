@@ -1,289 +1,68 @@
 import sys
 import os
 
-from badgeware import screen, PixelFont, shapes, brushes, io, run
-import random
-
-# GitHub contribution graph colors (dark mode)
-COMMIT_COLORS = [
-    (25, 108, 46),    # #196c2e - dark green
-    (46, 160, 67),    # #2ea043 - medium green
-    (86, 211, 100),   # #56d364 - bright green
-]
-
-PADDLE_COLOR = (86, 211, 100)  # #56d364 - bright green
-BALL_COLOR = (163, 113, 247)   # #a371f7 - purple (GitHub purple accent)
-BACKGROUND_COLOR = (13, 17, 23)  # Dark GitHub background
-
-# Game configuration
-SQUARE_SIZE = 6  # Size of each square
-SQUARE_GAP = 1   # Gap between squares
-UNIT = SQUARE_SIZE + SQUARE_GAP  # Total unit size (7 pixels)
-
-# Screen dimensions
-SCREEN_WIDTH = 160
-SCREEN_HEIGHT = 120
-
-# Brick configuration
-BRICK_COLS = 22  # Fill screen width (160 / 7 ≈ 22)
-BRICK_ROWS = 5
-BRICK_WIDTH = SQUARE_SIZE
-BRICK_HEIGHT = SQUARE_SIZE
-BRICK_OFFSET_X = 1
-BRICK_OFFSET_Y = 17
-
-# Paddle configuration
-PADDLE_SEGMENTS = 7  # Number of squares in paddle
-PADDLE_Y = 110
-PADDLE_SPEED = 3
+sys.path.insert(0, "/system/apps/commits")
+os.chdir("/system/apps/commits")
+sys.path.append("/system/lib")
 
-# Ball configuration
-BALL_SIZE = SQUARE_SIZE
-BALL_SPEED = 2
+from badgeware import screen, PixelFont, shapes, brushes, io, run
+from cellgrid import CellGrid
+from fixedstep import FixedStep, TUNED_HZ, lerp
+from game import (
+    Game, GameState, COMMIT_COLORS, PADDLE_COLOR, BALL_COLOR, BACKGROUND_COLOR,
+    SQUARE_SIZE, SQUARE_GAP, UNIT, SCREEN_WIDTH, SCREEN_HEIGHT, BRICK_COLS,
+    BRICK_ROWS, BRICK_OFFSET_X, BRICK_OFFSET_Y, PADDLE_SEGMENTS, BALL_SIZE,
+)
 
 # Load font
 small_font = PixelFont.load("/system/assets/fonts/nope.ppf")
 
-class GameState:
-    INTRO = 1
-    PLAYING = 2
-    GAME_OVER = 3
-    WIN = 4
+# Pre-create brushes for performance
+BACKGROUND_BRUSH = brushes.color(*BACKGROUND_COLOR)
+PADDLE_BRUSH = brushes.color(*PADDLE_COLOR)
+BALL_BRUSH = brushes.color(*BALL_COLOR)
 
-class Brick:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.alive = True
-    
-    def draw(self):
-        if self.alive:
-            screen.brush = brushes.color(*self.color)
-            screen.draw(shapes.rectangle(self.x, self.y, BRICK_WIDTH, BRICK_HEIGHT))
-    
-    def get_bounds(self):
-        return (self.x, self.y, self.x + BRICK_WIDTH, self.y + BRICK_HEIGHT)
+# Brick field as a cell grid: palette index 0 is an empty cell, 1 + i is COMMIT_COLORS[i]
+brick_grid = CellGrid(BRICK_COLS, BRICK_ROWS, [BACKGROUND_COLOR] + COMMIT_COLORS, UNIT, SQUARE_GAP)
+COLOR_INDEX = {color: i + 1 for i, color in enumerate(COMMIT_COLORS)}
 
-class Paddle:
-    def __init__(self):
-        self.x = SCREEN_WIDTH // 2 - (PADDLE_SEGMENTS * UNIT) // 2
-        self.y = PADDLE_Y
-    
-    def find_target_brick(self, bricks):
-        """Find the brightest green brick (target) for optimized play."""
-        brightest_green = COMMIT_COLORS[-1]  # (86, 211, 100) - brightest green
-        green_bricks = [b for b in bricks if b.alive and b.color == brightest_green]
-        
-        if green_bricks:
-            # Return leftmost bright green brick (systematic approach)
-            return min(green_bricks, key=lambda b: (b.x, b.y))
-        
-        # No bright green bricks, target any alive brick
-        alive_bricks = [b for b in bricks if b.alive]
-        if alive_bricks:
-            return min(alive_bricks, key=lambda b: (b.x, b.y))
-        
-        return None
-    
-    def update(self, ball=None, auto_play=False, bricks=None):
-        # Check for manual input - returns True if player is taking control
-        manual_input = io.BUTTON_A in io.held or io.BUTTON_C in io.held
-        
-        if auto_play and ball and ball.active and ball.vy > 0 and not manual_input:
-            # AI: Only move when ball is heading down
-            paddle_left = self.x
-            paddle_right = self.x + (PADDLE_SEGMENTS * UNIT) - SQUARE_GAP
-            ball_center = ball.x + BALL_SIZE // 2
-            
-            # Find target brick (brightest green)
-            target_brick = self.find_target_brick(bricks) if bricks else None
-            
-            if target_brick:
-                # Calculate desired paddle position to deflect ball toward target
-                target_x = target_brick.x + BRICK_WIDTH // 2
-                
-                # Estimate where ball will be when it reaches paddle height
-                # Simple prediction: if ball continues on current trajectory
-                if ball.vy != 0:
-                    time_to_paddle = (self.y - ball.y) / abs(ball.vy)
-                    predicted_ball_x = ball.x + (ball.vx * time_to_paddle)
-                else:
-                    predicted_ball_x = ball.x
-                
-                # Calculate paddle position that would deflect ball toward target
-                # When ball hits paddle, we want to aim it at the target
-                paddle_center = (paddle_left + paddle_right) // 2
-                
-                # If ball is heading down, position to intercept and angle toward target
-                desired_offset = 0
-                if predicted_ball_x < target_x:
-                    # Want ball to go right after bounce, so hit with left side of paddle
-                    desired_offset = -UNIT
-                elif predicted_ball_x > target_x:
-                    # Want ball to go left after bounce, so hit with right side of paddle
-                    desired_offset = UNIT
-                
-                desired_paddle_x = predicted_ball_x - (PADDLE_SEGMENTS * UNIT) // 2 + desired_offset
-                
-                # Move toward desired position
-                if self.x < desired_paddle_x:
-                    self.x += min(PADDLE_SPEED, desired_paddle_x - self.x)
-                elif self.x > desired_paddle_x:
-                    self.x -= min(PADDLE_SPEED, self.x - desired_paddle_x)
-            else:
-                # No target brick, just intercept the ball
-                if ball_center < paddle_left:
-                    move_needed = paddle_left - ball_center
-                    self.x -= min(PADDLE_SPEED, move_needed)
-                elif ball_center > paddle_right:
-                    move_needed = ball_center - paddle_right
-                    self.x += min(PADDLE_SPEED, move_needed)
-        else:
-            # Manual control
-            if io.BUTTON_A in io.held:
-                self.x -= PADDLE_SPEED
-            if io.BUTTON_C in io.held:
-                self.x += PADDLE_SPEED
-        
-        # Keep paddle on screen
-        self.x = max(0, min(self.x, SCREEN_WIDTH - (PADDLE_SEGMENTS * UNIT)))
-        
-        return manual_input
-    
-    def draw(self):
-        screen.brush = brushes.color(*PADDLE_COLOR)
-        for i in range(PADDLE_SEGMENTS):
-            x = self.x + (i * UNIT)
-            screen.draw(shapes.rectangle(x, self.y, SQUARE_SIZE, SQUARE_SIZE))
-    
-    def get_bounds(self):
-        return (self.x, self.y, self.x + (PADDLE_SEGMENTS * UNIT) - SQUARE_GAP, self.y + SQUARE_SIZE)
+def load_brick_grid(game):
+    """Load the whole brick field into the grid (once per level)"""
+    cells = brick_grid.cells
+    for brick in game.bricks:
+        cells[brick.row * BRICK_COLS + brick.col] = COLOR_INDEX[brick.color]
+    brick_grid.invalidate()
 
-class Ball:
-    def __init__(self):
-        self.reset()
-    
-    def reset(self):
-        self.x = SCREEN_WIDTH // 2
-        self.y = SCREEN_HEIGHT // 2
-        self.vx = BALL_SPEED if random.random() > 0.5 else -BALL_SPEED
-        self.vy = -BALL_SPEED
-        self.active = False
-    
-    def update(self, paddle, bricks, auto_play=False):
-        if not self.active:
-            # Ball follows paddle until launched
-            paddle_bounds = paddle.get_bounds()
-            self.x = (paddle_bounds[0] + paddle_bounds[2]) // 2
-            self.y = paddle.y - BALL_SIZE - 2
-            
-            if io.BUTTON_UP in io.pressed or io.BUTTON_B in io.pressed:
-                self.active = True
-                self.vy = -BALL_SPEED
-            return True
-        
-        # Move ball
-        self.x += self.vx
-        self.y += self.vy
-        
-        # Wall collisions (left, right, top)
-        if self.x <= 0 or self.x >= SCREEN_WIDTH - BALL_SIZE:
-            self.vx = -self.vx
-            self.x = max(0, min(self.x, SCREEN_WIDTH - BALL_SIZE))
-        
-        # Top collision - bounce at brick level if all bricks cleared
-        bricks_remaining = any(brick.alive for brick in bricks)
-        ceiling = 0 if bricks_remaining else BRICK_OFFSET_Y
-        
-        if self.y <= ceiling:
-            self.vy = -self.vy
-            self.y = ceiling
-        
-        # Bottom wall - lose life
-        if self.y >= SCREEN_HEIGHT:
-            return False
-        
-        # Paddle collision
-        paddle_bounds = paddle.get_bounds()
-        if (self.y + BALL_SIZE >= paddle_bounds[1] and 
-            self.y <= paddle_bounds[3] and
-            self.x + BALL_SIZE >= paddle_bounds[0] and
-            self.x <= paddle_bounds[2]):
-            
-            if self.vy > 0:  # Only bounce if moving downward
-                self.vy = -self.vy
-                self.y = paddle_bounds[1] - BALL_SIZE
-                
-                # Add some angle based on where ball hits paddle
-                paddle_center = (paddle_bounds[0] + paddle_bounds[2]) // 2
-                ball_center = self.x + BALL_SIZE // 2
-                offset = (ball_center - paddle_center) / ((paddle_bounds[2] - paddle_bounds[0]) // 2)
-                self.vx = int(offset * BALL_SPEED * 1.5)
-                
-                # In auto mode, ensure ball doesn't go straight up
-                if auto_play and abs(self.vx) < 1:
-                    self.vx = BALL_SPEED if ball_center > paddle_center else -BALL_SPEED
-        
-        # Brick collisions
-        for brick in bricks:
-            if not brick.alive:
-                continue
-            
-            brick_bounds = brick.get_bounds()
-            if (self.x + BALL_SIZE >= brick_bounds[0] and
-                self.x <= brick_bounds[2] and
-                self.y + BALL_SIZE >= brick_bounds[1] and
-                self.y <= brick_bounds[3]):
-                
-                brick.alive = False
-                
-                # Determine bounce direction
-                ball_center_x = self.x + BALL_SIZE // 2
-                ball_center_y = self.y + BALL_SIZE // 2
-                brick_center_x = (brick_bounds[0] + brick_bounds[2]) // 2
-                brick_center_y = (brick_bounds[1] + brick_bounds[3]) // 2
-                
-                dx = abs(ball_center_x - brick_center_x)
-                dy = abs(ball_center_y - brick_center_y)
-                
-                if dx > dy:
-                    self.vx = -self.vx
-                else:
-                    self.vy = -self.vy
-                
-                return True
-        
-        return True
-    
-    def draw(self):
-        screen.brush = brushes.color(*BALL_COLOR)
-        screen.draw(shapes.rectangle(int(self.x), int(self.y), BALL_SIZE, BALL_SIZE))
+def erase_brick(brick):
+    """Clear just the destroyed brick's cell"""
+    brick_grid.set(brick.row * BRICK_COLS + brick.col, 0)
+
+def draw_paddle(paddle, x):
+    screen.brush = PADDLE_BRUSH
+    for i in range(PADDLE_SEGMENTS):
+        screen.draw(shapes.rectangle(int(x) + (i * UNIT), paddle.y, SQUARE_SIZE, SQUARE_SIZE))
+
+def draw_ball(x, y):
+    screen.brush = BALL_BRUSH
+    screen.draw(shapes.rectangle(int(x), int(y), BALL_SIZE, BALL_SIZE))
 
 # Initialize game objects
-bricks = []
-paddle = Paddle()
-ball = Ball()
+game = Game(on_new_level=load_brick_grid, on_destroy=erase_brick)
 state = GameState.INTRO
-lives = 3
-score = 0
-auto_play = False
 
-def create_bricks():
-    global bricks
-    bricks = []
-    for row in range(BRICK_ROWS):
-        for col in range(BRICK_COLS):
-            x = BRICK_OFFSET_X + (col * UNIT)
-            y = BRICK_OFFSET_Y + (row * UNIT)
-            color = random.choice(COMMIT_COLORS)
-            bricks.append(Brick(x, y, color))
+# The game logic runs at a fixed rate, the frame rate it was written against
+# (see fixedstep.TUNED_HZ), so slow frames drop drawing instead of slowing the
+# ball down
+clock = FixedStep(TUNED_HZ)
+previous = (0, 0, 0)  # ball x, y and paddle x before the last step, for drawing
+launch_pending = False  # presses wait for the next step to see them
+toggle_pending = False
 
 def update():
-    global state, lives, score
+    global state
     
     # Clear screen
-    screen.brush = brushes.color(*BACKGROUND_COLOR)
+    screen.brush = BACKGROUND_BRUSH
     screen.draw(shapes.rectangle(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
     
     if state == GameState.INTRO:
@@ -296,7 +75,7 @@ def update():
         win_screen()
 
 def intro():
-    global state, lives, score
+    global state, previous
     
     # Draw title
     screen.font = small_font
@@ -338,76 +117,61 @@ def intro():
     
     if io.BUTTON_UP in io.pressed or io.BUTTON_B in io.pressed:
         state = GameState.PLAYING
-        lives = 3
-        score = 0
-        auto_play = False
-        create_bricks()
-        paddle = Paddle()
-        ball.reset()
+        game.reset()
+        clock.reset()
+        previous = (game.ball.x, game.ball.y, game.paddle.x)
 
 def play():
-    global state, lives, score, auto_play, paddle, ball
+    global state, previous, launch_pending, toggle_pending
     
-    # Toggle auto-play mode with DOWN button
+    # A/C move, B launches and DOWN toggles auto-play
+    if io.BUTTON_UP in io.pressed or io.BUTTON_B in io.pressed:
+        launch_pending = True
     if io.BUTTON_DOWN in io.pressed:
-        auto_play = not auto_play
-    
-    # Update game objects - check if manual input cancels auto mode
-    manual_input = paddle.update(ball, auto_play, bricks)
-    if manual_input and auto_play:
-        auto_play = False
-    
-    if not ball.update(paddle, bricks, auto_play):
-        if auto_play:
-            # Auto mode: restart without losing a life
-            score = 0
-            create_bricks()
-            paddle = Paddle()
-            ball = Ball()
-        else:
-            # Manual mode: lose a life
-            lives -= 1
-            if lives <= 0:
-                state = GameState.GAME_OVER
-            else:
-                ball.reset()
-    
-    # Check for win
-    if all(not brick.alive for brick in bricks):
-        if auto_play:
-            # Auto-restart: reset game with auto mode still enabled
-            score = 0
-            create_bricks()
-            paddle = Paddle()
-            ball = Ball()
-            # auto_play remains True
-        else:
-            state = GameState.WIN
-    
-    # Count score
-    score = sum(1 for brick in bricks if not brick.alive)
-    
-    # Draw game objects
-    for brick in bricks:
-        brick.draw()
-    
-    paddle.draw()
-    ball.draw()
+        toggle_pending = True
+    
+    # Run the fixed steps due this frame. A new level replaces the ball and
+    # paddle, so they're looked up afresh each step
+    for _ in range(clock.steps()):
+        previous = (game.ball.x, game.ball.y, game.paddle.x)
+        state = game.step(
+            left=io.BUTTON_A in io.held,
+            right=io.BUTTON_C in io.held,
+            launch=launch_pending,
+            toggle_auto=toggle_pending,
+        )
+        launch_pending = toggle_pending = False
+        if state != GameState.PLAYING:
+            break
+    
+    # Draw game objects - the brick field is one scaled blit plus its gap mask
+    brick_grid.render(BRICK_OFFSET_X, BRICK_OFFSET_Y)
+    
+    # Draw the paddle and ball part way between their last two positions,
+    # unless the ball was just put back on the paddle
+    alpha = clock.alpha
+    ball, paddle = game.ball, game.paddle
+    ball_x, ball_y = ball.x, ball.y
+    if abs(ball_x - previous[0]) <= UNIT and abs(ball_y - previous[1]) <= UNIT:
+        ball_x = lerp(previous[0], ball_x, alpha)
+        ball_y = lerp(previous[1], ball_y, alpha)
+    draw_paddle(paddle, lerp(previous[2], paddle.x, alpha))
+    draw_ball(ball_x, ball_y)
     
     # Draw UI
     screen.font = small_font
     screen.brush = brushes.color(255, 255, 255)
-    screen.text(f"Lives: {lives}", 2, 2)
+    screen.text(f"Lives: {game.lives}", 2, 2)
     
-    score_text = f"Score: {score}"
+    score_text = f"Score: {game.score}"
     w, _ = screen.measure_text(score_text)
     screen.text(score_text, SCREEN_WIDTH - w - 2, 2)
     
     # Show green 'A' when in auto-play mode
-    if auto_play:
+    if game.auto_play:
         auto_text = "A"
         w, _ = screen.measure_text(auto_text)
-        screen.brush = brushes.color(*PADDLE_COLOR)
+        screen.brush = PADDLE_BRUSH
         screen.text(auto_text, 80 - (w // 2), 2)
 
 def game_over():
@@ -421,7 +185,7 @@ def game_over():
     w, _ = screen.measure_text(title)
     screen.text(title, 80 - (w // 2), 40)
     
-    score_text = f"Commits: {score}"
+    score_text = f"Commits: {game.score}"
     w, _ = screen.measure_text(score_text)
     screen.text(score_text, 80 - (w // 2), 55)
     
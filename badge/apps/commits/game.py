@@ -0,0 +1,450 @@
+"""Commits game logic, kept free of badgeware so it can run headless (see sim.py)."""
+import random
+
+# GitHub contribution graph colors (dark mode)
+COMMIT_COLORS = [
+    (25, 108, 46),    # #196c2e - dark green
+    (46, 160, 67),    # #2ea043 - medium green
+    (86, 211, 100),   # #56d364 - bright green
+]
+
+PADDLE_COLOR = (86, 211, 100)  # #56d364 - bright green
+BALL_COLOR = (163, 113, 247)   # #a371f7 - purple (GitHub purple accent)
+BACKGROUND_COLOR = (13, 17, 23)  # Dark GitHub background
+
+# Game configuration
+SQUARE_SIZE = 6  # Size of each square
+SQUARE_GAP = 1   # Gap between squares
+UNIT = SQUARE_SIZE + SQUARE_GAP  # Total unit size (7 pixels)
+
+# Screen dimensions
+SCREEN_WIDTH = 160
+SCREEN_HEIGHT = 120
+
+# Brick configuration
+BRICK_COLS = 22  # Fill screen width (160 / 7 ≈ 22)
+BRICK_ROWS = 5
+BRICK_WIDTH = SQUARE_SIZE
+BRICK_HEIGHT = SQUARE_SIZE
+BRICK_OFFSET_X = 1
+BRICK_OFFSET_Y = 17
+
+# Paddle configuration
+PADDLE_SEGMENTS = 7  # Number of squares in paddle
+PADDLE_Y = 110
+PADDLE_SPEED = 3
+
+# Ball configuration
+BALL_SIZE = SQUARE_SIZE
+BALL_SPEED = 2
+
+BRIGHT_GREEN = COMMIT_COLORS[-1]  # Auto-play target colour
+
+class GameState:
+    INTRO = 1
+    PLAYING = 2
+    GAME_OVER = 3
+    WIN = 4
+
+class Brick:
+    def __init__(self, x, y, color, col=0, row=0):
+        self.x = x
+        self.y = y
+        self.col = col
+        self.row = row
+        self.color = color
+        self.alive = True
+    
+    def get_bounds(self):
+        return (self.x, self.y, self.x + BRICK_WIDTH, self.y + BRICK_HEIGHT)
+
+class BrickIndex:
+    """Per-column index of the lowest alive brick and remaining bright green targets.
+    
+    Built once per level and updated as bricks die, so auto-play never has to
+    scan the full brick list.
+    """
+    def __init__(self, bricks, on_destroy=None):
+        self.on_destroy = on_destroy
+        self.columns = [[None] * BRICK_ROWS for _ in range(BRICK_COLS)]
+        self.lowest = [None] * BRICK_COLS
+        self.bright = [0] * BRICK_COLS
+        self.alive_count = 0
+        # Leftmost columns that may still hold a bright/any alive brick (only ever advance)
+        self.bright_col = 0
+        self.alive_col = 0
+        
+        for brick in bricks:
+            self.columns[brick.col][brick.row] = brick
+            if brick.alive:
+                self.alive_count += 1
+                if brick.color == BRIGHT_GREEN:
+                    self.bright[brick.col] += 1
+                lowest = self.lowest[brick.col]
+                if lowest is None or brick.row > lowest.row:
+                    self.lowest[brick.col] = brick
+    
+    def destroy(self, brick):
+        """Kill a brick, update the index and let the renderer know"""
+        brick.alive = False
+        self.remove(brick)
+        if self.on_destroy:
+            self.on_destroy(brick)
+    
+    def remove(self, brick):
+        """Update the index after a brick has been destroyed"""
+        col = brick.col
+        self.alive_count -= 1
+        if brick.color == BRIGHT_GREEN:
+            self.bright[col] -= 1
+        
+        # Everything below the lowest brick is already dead, so only look upwards
+        if self.lowest[col] is brick:
+            self.lowest[col] = None
+            for row in range(brick.row - 1, -1, -1):
+                if self.columns[col][row].alive:
+                    self.lowest[col] = self.columns[col][row]
+                    break
+    
+    def target(self):
+        """Return the exposed brick in the leftmost column with bright green left, else any column"""
+        while self.bright_col < BRICK_COLS and not self.bright[self.bright_col]:
+            self.bright_col += 1
+        if self.bright_col < BRICK_COLS:
+            return self.lowest[self.bright_col]
+        
+        while self.alive_col < BRICK_COLS and self.lowest[self.alive_col] is None:
+            self.alive_col += 1
+        if self.alive_col < BRICK_COLS:
+            return self.lowest[self.alive_col]
+        
+        return None
+
+def fold_x(x):
+    """Fold an unbounded ball x position back into the playfield, mirroring off the side walls"""
+    span = SCREEN_WIDTH - BALL_SIZE
+    x %= 2 * span
+    return 2 * span - x if x > span else x
+
+def predict_ball_x(x, y, vx, vy, target_y):
+    """Closed-form ball x when it reaches target_y, including side wall bounces"""
+    if vy == 0:
+        return x
+    return fold_x(x + vx * ((target_y - y) / vy))
+
+def paddle_offset_for(vx):
+    """Normalised paddle hit offset (-1..1) that makes Ball.update produce vx"""
+    scale = BALL_SPEED * 1.5
+    offset = (vx + (0.5 if vx > 0 else -0.5)) / scale
+    return max(-1, min(1, offset))
+
+# Outgoing horizontal speeds the paddle can produce (never straight up in auto mode)
+AIM_SPEEDS = [vx for vx in range(-int(BALL_SPEED * 1.5), int(BALL_SPEED * 1.5) + 1) if vx]
+
+class Paddle:
+    def __init__(self):
+        self.x = SCREEN_WIDTH // 2 - (PADDLE_SEGMENTS * UNIT) // 2
+        self.y = PADDLE_Y
+        # Rallies since a brick last died, used to break out of repeating orbits
+        self.stale_rallies = 0
+        self.descending = False
+        self.last_alive = None
+        # Paddle position planned for the current descent, keyed on the ball's vx
+        self.plan = None
+    
+    def find_target_brick(self, index):
+        """Find the brightest green brick (target) for optimized play."""
+        return index.target() if index else None
+    
+    def aim(self, hit_x, frames, target_brick):
+        """Pick the paddle x that sends a ball hitting at hit_x (in frames) closest to the target brick"""
+        half_width = ((PADDLE_SEGMENTS * UNIT) - SQUARE_GAP) // 2
+        target_x = target_brick.x + (BRICK_WIDTH - BALL_SIZE) / 2
+        launch_y = self.y - BALL_SIZE
+        # The ball crosses the target row on the way up and again after the ceiling bounce
+        up_y = target_brick.y + BRICK_HEIGHT
+        down_y = -(target_brick.y - BALL_SIZE)  # unfolded off the ceiling at y=0
+        
+        def miss(vx):
+            up = abs(predict_ball_x(hit_x, launch_y, vx, -BALL_SPEED, up_y) - target_x)
+            down = abs(predict_ball_x(hit_x, launch_y, vx, -BALL_SPEED, down_y) - target_x)
+            return min(up, down)
+        
+        # Ball.update derives vx from the ball centre's offset from the paddle centre.
+        # Rounded so the paddle, and a ball reset onto it, stay on whole pixels
+        ball_center = hit_x + BALL_SIZE // 2
+        def paddle_x(vx):
+            return round(ball_center - paddle_offset_for(vx) * half_width - half_width)
+        
+        # Only consider shots the paddle can get into position for in time
+        reach = PADDLE_SPEED * frames
+        ranked = sorted((vx for vx in AIM_SPEEDS if abs(paddle_x(vx) - self.x) <= reach), key=miss)
+        if not ranked:
+            return round(ball_center - half_width)
+        
+        # Take the rebound that lands closest to the target; if the ball keeps
+        # coming back without breaking anything, shake things up with another shot
+        vx = ranked[random.randrange(len(ranked)) if self.stale_rallies else 0]
+        return paddle_x(vx)
+    
+    def update(self, ball=None, auto_play=False, index=None, left=False, right=False):
+        # Check for manual input - returns True if player is taking control
+        manual_input = left or right
+        
+        # Count rallies that came back down without destroying a brick
+        if ball and index and ball.vy > 0 and not self.descending:
+            self.plan = None
+            if index.alive_count == self.last_alive:
+                self.stale_rallies += 1
+            else:
+                self.stale_rallies = 0
+            self.last_alive = index.alive_count
+        self.descending = bool(ball and ball.vy > 0)
+        
+        if auto_play and ball and ball.active and ball.vy > 0 and not manual_input:
+            # AI: Only move when ball is heading down
+            paddle_left = self.x
+            paddle_right = self.x + (PADDLE_SEGMENTS * UNIT) - SQUARE_GAP
+            ball_center = ball.x + BALL_SIZE // 2
+            
+            # Find target brick (brightest green)
+            target_brick = self.find_target_brick(index)
+            
+            if target_brick:
+                # Predict where the ball meets the paddle, then aim the rebound at the target
+                # (planned once per descent, or again if a brick knocks the ball sideways)
+                if self.plan is None or self.plan[0] != ball.vx:
+                    hit_y = self.y - BALL_SIZE
+                    hit_x = predict_ball_x(ball.x, ball.y, ball.vx, ball.vy, hit_y)
+                    self.plan = (ball.vx, self.aim(hit_x, (hit_y - ball.y) / ball.vy, target_brick))
+                desired_paddle_x = self.plan[1]
+                
+                # Move toward desired position
+                if self.x < desired_paddle_x:
+                    self.x += min(PADDLE_SPEED, desired_paddle_x - self.x)
+                elif self.x > desired_paddle_x:
+                    self.x -= min(PADDLE_SPEED, self.x - desired_paddle_x)
+            else:
+                # No target brick, just intercept the ball
+                if ball_center < paddle_left:
+                    move_needed = paddle_left - ball_center
+                    self.x -= min(PADDLE_SPEED, move_needed)
+                elif ball_center > paddle_right:
+                    move_needed = ball_center - paddle_right
+                    self.x += min(PADDLE_SPEED, move_needed)
+        else:
+            # Manual control
+            if left:
+                self.x -= PADDLE_SPEED
+            if right:
+                self.x += PADDLE_SPEED
+        
+        # Keep paddle on screen
+        self.x = max(0, min(self.x, SCREEN_WIDTH - (PADDLE_SEGMENTS * UNIT)))
+        
+        return manual_input
+    
+    def get_bounds(self):
+        return (self.x, self.y, self.x + (PADDLE_SEGMENTS * UNIT) - SQUARE_GAP, self.y + SQUARE_SIZE)
+
+class Ball:
+    def __init__(self):
+        # Collision counters, reported by the headless benchmark
+        self.wall_hits = 0
+        self.paddle_hits = 0
+        self.brick_hits = 0
+        self.reset()
+    
+    def reset(self):
+        self.x = SCREEN_WIDTH // 2
+        self.y = SCREEN_HEIGHT // 2
+        self.vx = BALL_SPEED if random.random() > 0.5 else -BALL_SPEED
+        self.vy = -BALL_SPEED
+        self.active = False
+    
+    def update(self, paddle, index, auto_play=False, launch=False):
+        if not self.active:
+            # Ball follows paddle until launched
+            paddle_bounds = paddle.get_bounds()
+            self.x = (paddle_bounds[0] + paddle_bounds[2]) // 2
+            self.y = paddle.y - BALL_SIZE - 2
+            
+            if launch:
+                self.active = True
+                self.vy = -BALL_SPEED
+            return True
+        
+        # Move ball
+        self.x += self.vx
+        self.y += self.vy
+        
+        # Wall collisions (left, right, top)
+        if self.x <= 0 or self.x >= SCREEN_WIDTH - BALL_SIZE:
+            self.vx = -self.vx
+            self.x = max(0, min(self.x, SCREEN_WIDTH - BALL_SIZE))
+            self.wall_hits += 1
+        
+        # Top collision - bounce at brick level if all bricks cleared
+        bricks_remaining = index.alive_count > 0
+        ceiling = 0 if bricks_remaining else BRICK_OFFSET_Y
+        
+        if self.y <= ceiling:
+            self.vy = -self.vy
+            self.y = ceiling
+        
+        # Bottom wall - lose life
+        if self.y >= SCREEN_HEIGHT:
+            return False
+        
+        # Paddle collision
+        paddle_bounds = paddle.get_bounds()
+        if (self.y + BALL_SIZE >= paddle_bounds[1] and 
+            self.y <= paddle_bounds[3] and
+            self.x + BALL_SIZE >= paddle_bounds[0] and
+            self.x <= paddle_bounds[2]):
+            
+            if self.vy > 0:  # Only bounce if moving downward
+                self.paddle_hits += 1
+                self.vy = -self.vy
+                self.y = paddle_bounds[1] - BALL_SIZE
+                
+                # Add some angle based on where ball hits paddle
+                paddle_center = (paddle_bounds[0] + paddle_bounds[2]) // 2
+                ball_center = self.x + BALL_SIZE // 2
+                offset = (ball_center - paddle_center) / ((paddle_bounds[2] - paddle_bounds[0]) // 2)
+                self.vx = int(offset * BALL_SPEED * 1.5)
+                
+                # In auto mode, ensure ball doesn't go straight up
+                if auto_play and abs(self.vx) < 1:
+                    self.vx = BALL_SPEED if ball_center > paddle_center else -BALL_SPEED
+        
+        # Brick collisions - only the grid cells the ball overlaps can be hit
+        # (checked in the same row-major order as the brick list)
+        x = self.x - BRICK_OFFSET_X
+        y = self.y - BRICK_OFFSET_Y
+        col_first = max(0, (x - BRICK_WIDTH) // UNIT)
+        col_last = min(BRICK_COLS - 1, (x + BALL_SIZE) // UNIT)
+        row_first = max(0, (y - BRICK_HEIGHT) // UNIT)
+        row_last = min(BRICK_ROWS - 1, (y + BALL_SIZE) // UNIT)
+        for row in range(row_first, row_last + 1):
+            for col in range(col_first, col_last + 1):
+                brick = index.columns[col][row]
+                if not brick.alive:
+                    continue
+                
+                brick_bounds = brick.get_bounds()
+                if not (self.x + BALL_SIZE >= brick_bounds[0] and
+                        self.x <= brick_bounds[2] and
+                        self.y + BALL_SIZE >= brick_bounds[1] and
+                        self.y <= brick_bounds[3]):
+                    continue
+                
+                index.destroy(brick)
+                self.brick_hits += 1
+                
+                # Determine bounce direction
+                ball_center_x = self.x + BALL_SIZE // 2
+                ball_center_y = self.y + BALL_SIZE // 2
+                brick_center_x = (brick_bounds[0] + brick_bounds[2]) // 2
+                brick_center_y = (brick_bounds[1] + brick_bounds[3]) // 2
+                
+                dx = abs(ball_center_x - brick_center_x)
+                dy = abs(ball_center_y - brick_center_y)
+                
+                if dx > dy:
+                    self.vx = -self.vx
+                else:
+                    self.vy = -self.vy
+                
+                return True
+        
+        return True
+
+def create_bricks():
+    bricks = []
+    for row in range(BRICK_ROWS):
+        for col in range(BRICK_COLS):
+            x = BRICK_OFFSET_X + (col * UNIT)
+            y = BRICK_OFFSET_Y + (row * UNIT)
+            color = random.choice(COMMIT_COLORS)
+            bricks.append(Brick(x, y, color, col, row))
+    return bricks
+
+class Game:
+    """One game of commits: the bricks, paddle, ball and score, without any drawing.
+    
+    The app feeds in button state each frame and renders the result; the headless
+    benchmark drives it directly. `on_new_level` is called with the game whenever
+    a fresh brick field is created and `on_destroy` with each brick that dies.
+    """
+    def __init__(self, on_new_level=None, on_destroy=None):
+        self.on_new_level = on_new_level
+        self.on_destroy = on_destroy
+        self.levels_cleared = 0
+        self.balls_lost = 0
+        self.ball = None
+        self.hits = [0, 0, 0]  # wall, paddle and brick collisions of finished balls
+        self.reset()
+    
+    def reset(self):
+        self.lives = 3
+        self.score = 0
+        self.auto_play = False
+        self.new_level()
+    
+    def new_level(self):
+        if self.ball:
+            self.hits[0] += self.ball.wall_hits
+            self.hits[1] += self.ball.paddle_hits
+            self.hits[2] += self.ball.brick_hits
+        self.score = 0
+        self.bricks = create_bricks()
+        self.index = BrickIndex(self.bricks, self.on_destroy)
+        self.paddle = Paddle()
+        self.ball = Ball()
+        if self.on_new_level:
+            self.on_new_level(self)
+    
+    def step(self, left=False, right=False, launch=False, toggle_auto=False):
+        """Advance one frame and return the resulting GameState"""
+        # Toggle auto-play mode
+        if toggle_auto:
+            self.auto_play = not self.auto_play
+        
+        # Update game objects - check if manual input cancels auto mode
+        manual_input = self.paddle.update(self.ball, self.auto_play, self.index, left, right)
+        if manual_input and self.auto_play:
+            self.auto_play = False
+        
+        if not self.ball.update(self.paddle, self.index, self.auto_play, launch):
+            self.balls_lost += 1
+            if self.auto_play:
+                # Auto mode: restart without losing a life
+                self.new_level()
+            else:
+                # Manual mode: lose a life
+                self.lives -= 1
+                if self.lives <= 0:
+                    return GameState.GAME_OVER
+                self.ball.reset()
+        
+        # Count score
+        self.score = len(self.bricks) - self.index.alive_count
+        
+        # Check for win
+        if self.index.alive_count == 0:
+            self.levels_cleared += 1
+            if not self.auto_play:
+                return GameState.WIN
+            # Auto-restart: reset game with auto mode still enabled
+            self.new_level()
+        
+        return GameState.PLAYING
+    
+    def collisions(self):
+        """Total (wall, paddle, brick) collisions so far, including the ball in play"""
+        return (
+            self.hits[0] + self.ball.wall_hits,
+            self.hits[1] + self.ball.paddle_hits,
+            self.hits[2] + self.ball.brick_hits,
+        )
@@ -0,0 +1,121 @@
+"""Headless commits auto-play benchmark.
+
+Plays boards with the auto-play AI as fast as possible using only the game
+logic in game.py (no screen or badgeware), so it runs on the host or on the
+MicroPython unix port:
+
+    python sim.py [boards] [seed]
+    micropython sim.py [boards] [seed]
+
+Reports the logic frame rate, average frames to clear a board and collision
+counts. Use it to compare any physics or AI change.
+
+It then plays some games where the player takes over from auto-play part way
+through a board, loses the ball and plays on with random input, as the AI
+leaves the paddle wherever it aimed it.
+"""
+import sys
+import time
+import random
+
+from game import Game, GameState
+
+# Give up on a board that takes this long (the AI is stuck)
+MAX_FRAMES_PER_BOARD = 100000
+
+
+def ticks_us():
+    # MicroPython has ticks_us, CPython has perf_counter
+    if hasattr(time, "ticks_us"):
+        return time.ticks_us()
+    return int(time.perf_counter() * 1000000)
+
+
+def simulate(boards=1000, seed=None):
+    """Auto-play the given number of boards and return a dict of stats"""
+    if seed is not None:
+        random.seed(seed)
+
+    game = Game()
+    game.auto_play = True
+
+    frames = 0
+    board_frames = []
+    timeouts = 0
+    start = ticks_us()
+
+    while len(board_frames) + timeouts < boards:
+        cleared = game.levels_cleared
+        count = 0
+        while game.levels_cleared == cleared and count < MAX_FRAMES_PER_BOARD:
+            game.step(launch=True)
+            count += 1
+        frames += count
+
+        if game.levels_cleared == cleared:
+            timeouts += 1
+            game.new_level()
+        else:
+            board_frames.append(count)
+
+    elapsed = (ticks_us() - start) / 1000000
+    walls, paddles, bricks = game.collisions()
+    cleared = len(board_frames)
+
+    return {
+        "boards": boards,
+        "cleared": cleared,
+        "timeouts": timeouts,
+        "balls_lost": game.balls_lost,
+        "frames": frames,
+        "seconds": elapsed,
+        "fps": frames / elapsed if elapsed else 0,
+        "frames_to_clear": sum(board_frames) / cleared if cleared else 0,
+        "wall_hits": walls,
+        "paddle_hits": paddles,
+        "brick_hits": bricks,
+    }
+
+
+def takeover(games=200, seed=None, frames=2000):
+    """Play games that switch from auto-play to random input, returns the frames played"""
+    if seed is not None:
+        random.seed(seed)
+
+    played = 0
+    for _ in range(games):
+        game = Game()
+        game.auto_play = True
+        for _ in range(random.randrange(50, 2000)):
+            game.step(launch=True)
+            played += 1
+
+        # a press takes over, then the ball is lost and relaunched by hand
+        state = GameState.PLAYING
+        left = right = False
+        for count in range(frames):
+            if count % 20 == 0:
+                left, right = random.random() < 0.3, random.random() < 0.3
+            state = game.step(left=left or count == 0, right=right, launch=count > 200)
+            played += 1
+            if state != GameState.PLAYING:
+                break
+    return played
+
+
+def report(stats):
+    boards = stats["boards"]
+    print(f"boards:          {stats['cleared']}/{boards} cleared, {stats['timeouts']} timed out")
+    print(f"balls lost:      {stats['balls_lost']}")
+    print(f"logic frames:    {stats['frames']} in {stats['seconds']:.2f}s ({stats['fps']:.0f} fps)")
+    print(f"frames to clear: {stats['frames_to_clear']:.1f} avg")
+    print(f"collisions:      {stats['wall_hits'] / boards:.1f} wall, "
+          f"{stats['paddle_hits'] / boards:.1f} paddle, "
+          f"{stats['brick_hits'] / boards:.1f} brick per board")
+
+
+if __name__ == "__main__":
+    boards = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    report(simulate(boards, seed))
+    print(f"takeovers:       {takeover(seed=seed)} frames played")
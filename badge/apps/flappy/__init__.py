@@ -3,10 +3,13 @@ import os
 
 sys.path.insert(0, "/system/apps/flappy")
 os.chdir("/system/apps/flappy")
+sys.path.append("/system/lib")
 
 from badgeware import screen, Image, PixelFont, SpriteSheet, io, brushes, shapes, run
 from mona import Mona
 from obstacle import Obstacle
+from parallax import Parallax, Layer
+from fixedstep import FixedStep, TUNED_HZ
 
 background = Image.load("assets/background.png")
 grass = Image.load("assets/grass.png")
@@ -25,15 +28,28 @@ class GameState:
 
 state = GameState.INTRO
 
+# the game logic runs at a fixed rate, the frame rate it was written against
+# (see fixedstep.TUNED_HZ), so slow frames drop drawing instead of slowing the
+# game down
+clock = FixedStep(TUNED_HZ)
+
 
 def update():
+    global background_offset
+
+    steps = clock.steps()
+
+    # if we're on the intro screen or mona is alive then scroll the background
+    if not mona or not mona.is_dead() or state == GameState.INTRO:
+        background_offset += steps
+
     draw_background()
 
     if state == GameState.INTRO:
         intro()
 
     if state == GameState.PLAYING:
-        play()
+        play(steps)
 
     if state == GameState.GAME_OVER:
         game_over()
@@ -58,8 +74,8 @@ def intro():
     if io.BUTTON_A in io.pressed:
         # reset game state
         state = GameState.PLAYING
-        Obstacle.obstacles = []
-        Obstacle.next_spawn_time = io.ticks + 500
+        Obstacle.clear()
+        Obstacle.next_spawn_time = clock.time + 500
         mona = Mona()
 
 # handle the main game loop and user input. each tick we'll update the game
@@ -67,28 +83,23 @@ def intro():
 # draw the background and sprites
 
 
-def play():
+def play(steps):
     global state
 
     # if the user has pressed A then make mona jump for her life!
     if not mona.is_dead() and io.BUTTON_A in io.pressed:
         mona.jump()
 
-    # update player and check for collision
-    mona.update()
-
-    # spawn a new obstacle if the spawn timer has elapsed
-    if not mona.is_dead() and Obstacle.next_spawn_time and io.ticks > Obstacle.next_spawn_time:
-        Obstacle.spawn()
+    # run the fixed steps of game logic due this frame
+    for _ in range(steps):
+        step()
 
-    # update obstacle positions and draw them
+    # draw the obstacles
     for obstacle in Obstacle.obstacles:
-        if not mona.is_dead():
-            obstacle.update()
         obstacle.draw()
 
-    # draw our hero, mona
-    mona.draw()
+    # draw our hero, mona, part way between her last two positions
+    mona.draw(clock.alpha)
 
     # show the player their current score
     screen.font = small_font
@@ -99,6 +110,22 @@ def play():
         if mona.is_done_dying():
             state = GameState.GAME_OVER
 
+# one fixed step of game logic
+
+
+def step():
+    # update player and check for collision
+    mona.update(clock.dt)
+
+    # spawn a new obstacle if the spawn timer has elapsed
+    if not mona.is_dead() and Obstacle.next_spawn_time and clock.time > Obstacle.next_spawn_time:
+        Obstacle.spawn(clock.time)
+
+    # update obstacle positions
+    if not mona.is_dead():
+        for obstacle in Obstacle.obstacles:
+            obstacle.update()
+
 # handle the GAME OVER screen. show the player what score they achieved and
 # provide instructions for how to start again
 
@@ -124,35 +151,18 @@ def game_over():
         state = GameState.INTRO
 
 
-# draw the scrolling background with parallax layers
-background_offset = 0
+# draw the scrolling background with parallax layers: the distant background
+# and clouds (one cloud width apart) scroll at 1/8 speed, the grass at 1/4
+background_offset = 0  # in logic steps
+scenery = Parallax((73, 219, 255), [
+    Layer(background, 120 - background.height, 8),
+    Layer(cloud, 20, 8, cloud.width * 2),
+    Layer(grass, 120 - grass.height, 4),
+])
 
 
 def draw_background():
-    global background_offset
-
-    # clear the whole screen in a bright blue
-    screen.brush = brushes.color(73, 219, 255)
-    screen.draw(shapes.rectangle(0, 0, 160, 120))
-
-    # if we're on the intro screen or mona is alive then scroll the background
-    if not mona or not mona.is_dead() or state == GameState.INTRO:
-        background_offset += 1
-
-    for i in range(3):
-        # draw the distance background
-        bo = ((-background_offset / 8) % background.width) - screen.width
-        screen.blit(background, bo + (background.width * i),
-                    120 - background.height)
-
-        # draw the cloud background
-        bo = ((-background_offset / 8) % (cloud.width * 2)) - screen.width
-        screen.blit(cloud, bo + (cloud.width * 2 * i), 20)
-
-    for i in range(3):
-        # draw the grass layer
-        bo = ((-background_offset / 4) % (grass.width)) - screen.width
-        screen.blit(grass, bo + (grass.width * i), 120 - grass.height)
+    scenery.draw(background_offset)
 
 # a couple of helper functions for formatting text
 
@@ -1,5 +1,6 @@
 from badgeware import screen, SpriteSheet, io
-from obstacle import Obstacle
+from obstacle import Obstacle, OBSTACLE_WIDTH
+from fixedstep import lerp
 
 sprites = SpriteSheet("assets/mona.png", 7, 2)
 alive = sprites.animation(0, 0, 7)
@@ -12,40 +13,47 @@ class Mona:
         self.score = 0
         self.velocity = 0
         self.gravity = 7
-        self.last_update = None
+        self.previous_y = self.pos[1]  # where mona was before the last step, for drawing
         self.died_at = None
         self.done_dying = False
 
-    def update(self):
+    def update(self, dt):
         # don't do any of the mona update stuff if they're dead
         if self.is_dead():
             return
 
-        if self.last_update:
-            # apply gravity to mona's velocity based on the time since the last update
-            time_delta = (io.ticks - self.last_update) / 1000
-            self.velocity = self.velocity + (self.gravity * time_delta)
+        # apply gravity to mona's velocity over one fixed step of dt seconds
+        self.velocity = self.velocity + (self.gravity * dt)
 
-            # move mona based on their current velocity
-            self.pos = (self.pos[0], self.pos[1] + self.velocity)
+        # move mona based on their current velocity
+        self.previous_y = self.pos[1]
+        self.pos = (self.pos[0], self.pos[1] + self.velocity)
 
-            # if mona falls off the bottom of the screen it's GAME OVER
-            if self.pos[1] > 92:
-                self.die()
+        # if mona falls off the bottom of the screen it's GAME OVER
+        if self.pos[1] > 92:
+            self.die()
 
-            # but if mona bangs their head on the ceiling it's ok, we'll just take away any upward momentum
-            if self.pos[1] <= 0:
-                self.pos = (self.pos[0], 0)
-                self.velocity = 0
-
-        self.last_update = io.ticks
+        # but if mona bangs their head on the ceiling it's ok, we'll just take away any upward momentum
+        if self.pos[1] <= 0:
+            self.pos = (self.pos[0], 0)
+            self.velocity = 0
 
         # check if we've passed or hit any obstacles
         mona_bounds = self.bounds()
+        mona_right = mona_bounds[0] + mona_bounds[2]
         for obstacle in Obstacle.obstacles:
+            # obstacles are ordered left to right, so once one starts past mona
+            # so do all the rest
+            if obstacle.x >= mona_right:
+                break
+
             # perform an intersection test between mona's hit box and the hit box
-            # of this obstacles top and bottom sections
-            for obstacle_bounds in obstacle.bounds():
+            # of this obstacles top and bottom sections, if it overlaps her x-range
+            if obstacle.x + OBSTACLE_WIDTH <= mona_bounds[0]:
+                obstacle_sections = ()
+            else:
+                obstacle_sections = obstacle.bounds()
+            for obstacle_bounds in obstacle_sections:
                 x1 = max(obstacle_bounds[0], mona_bounds[0])
                 y1 = max(obstacle_bounds[1], mona_bounds[1])
                 x2 = min(
@@ -84,7 +92,7 @@ class Mona:
         # be a little generous with monas bounding box for collisions
         return (self.pos[0] + 3, self.pos[1] + 2, 18, 20)
 
-    def draw(self):
+    def draw(self, alpha=1):
         if not self.is_dead():
             # this is a bit gnarly but basically we want to convert mona's currently
             # velocity into the correct animation frame for her motion.
@@ -95,7 +103,7 @@ class Mona:
             # clamped velocity to the 0...7 sprites that represent her
             frame = int(frame * 2)
             sprite = alive.frame(int(frame))
-            screen.blit(sprite, self.pos[0], self.pos[1])
+            screen.blit(sprite, self.pos[0], lerp(self.previous_y, self.pos[1], alpha))
         else:
             # if mona is dying then play the death animation
             frame = (io.ticks - self.died_at) / 100
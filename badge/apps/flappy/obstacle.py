@@ -1,24 +1,65 @@
 import random
-from badgeware import SpriteSheet, io, screen
+from badgeware import SpriteSheet, Image, screen
 
 sprites = SpriteSheet("assets/obstacles.png", 2, 1)
 
+# each pipe is three 24x24 sprites, the last one spiked
+OBSTACLE_WIDTH = 24
+PIPE_HEIGHT = 72
+
+# obstacles are recycled, a new one spawns every 1.5 seconds (45 pixels
+# apart) so no more than five are ever alive at once
+POOL_SIZE = 6
+
 
 class Obstacle:
-    # the list of active obstacles
+    # the list of active obstacles, oldest (leftmost) first
     obstacles = []
+    # spare obstacles ready to be reused
+    pool = []
     next_spawn_time = None
+    # composited pipe columns, keyed by gap height
+    columns = {}
+
+    def spawn(now):
+        # recycle any obstacles that are now off screen, they're always at the front
+        while Obstacle.obstacles and Obstacle.obstacles[0].x <= -OBSTACLE_WIDTH:
+            Obstacle.pool.append(Obstacle.obstacles.pop(0))
+
+        # reuse a spare obstacle and reset the obstacle spawn timer
+        obstacle = Obstacle.pool.pop() if Obstacle.pool else Obstacle()
+        obstacle.reset()
+        Obstacle.obstacles.append(obstacle)
+        Obstacle.next_spawn_time = now + 1500
 
-    def spawn():
-        # create a new obstacle and reset the obstacle spawn timer
-        Obstacle.obstacles.append(Obstacle())
-        Obstacle.next_spawn_time = io.ticks + 1500
+    def clear():
+        # return every active obstacle to the pool
+        Obstacle.pool.extend(Obstacle.obstacles)
+        Obstacle.obstacles.clear()
 
-        # clean up any obstacles that are now off screen and can be removed
-        Obstacle.obstacles = [o for o in Obstacle.obstacles if o.x > -24]
+    def column(gap_height):
+        # both pipes with the gap between them, composited into one image the
+        # first time each gap height is used so drawing is a single blit
+        image = Obstacle.columns.get(gap_height)
+        if image is None:
+            image = Image(0, 0, OBSTACLE_WIDTH, PIPE_HEIGHT * 2 + gap_height)
+            image.scale_blit(sprites.sprite(0, 0), 0, 0, 24, 24)
+            image.scale_blit(sprites.sprite(0, 0), 0, 24, 24, 24)
+            image.scale_blit(sprites.sprite(1, 0), 0, 48, 24, 24)  # spikes, yikes!
+
+            # the bottom half is the same sprites flipped
+            bottom = PIPE_HEIGHT + gap_height
+            image.scale_blit(sprites.sprite(1, 0), 0, bottom, 24, -24)  # spikes, yikes!
+            image.scale_blit(sprites.sprite(0, 0), 0, bottom + 24, 24, -24)
+            image.scale_blit(sprites.sprite(0, 0), 0, bottom + 48, 24, -24)
+            Obstacle.columns[gap_height] = image
+        return image
 
     def __init__(self):
-        # position the new obstacle off the right hand side of the screen and
+        self.reset()
+
+    def reset(self):
+        # position the obstacle off the right hand side of the screen and
         # randomise the height of the gap
         self.x = screen.width
         self.gap_height = 60
@@ -28,30 +69,20 @@ class Obstacle:
         self.passed = False
 
     def update(self):
-        # moves the obstacle to the left by one pixel each frame
+        # moves the obstacle to the left by one pixel each step
         self.x -= 1
 
     def bounds(self):
         # be a little generous with obstacle bounding boxes for collisions
         return (
-            (self.x, 0, 24, self.gap_y - 2),
+            (self.x, 0, OBSTACLE_WIDTH, self.gap_y - 2),
             (self.x, self.gap_y + self.gap_height + 2,
-                24, 120 - self.gap_y + self.gap_height - 2)
+                OBSTACLE_WIDTH, 120 - self.gap_y + self.gap_height - 2)
         )
 
     def draw(self):
-        # draw the top half off the obstacle
-        screen.scale_blit(sprites.sprite(0, 0), self.x,
-                          self.gap_y - 72, 24, 24)
-        screen.scale_blit(sprites.sprite(0, 0), self.x,
-                          self.gap_y - 48, 24, 24)
-        screen.scale_blit(sprites.sprite(1, 0), self.x,
-                          self.gap_y - 24, 24, 24)  # spikes, yikes!
-
-        # draw the bottom half off the obstacle
-        screen.scale_blit(sprites.sprite(1, 0), self.x, self.gap_y +
-                          self.gap_height, 24, -24)  # spikes, yikes!
-        screen.scale_blit(sprites.sprite(0, 0), self.x,
-                          self.gap_y + self.gap_height + 24, 24, -24)
-        screen.scale_blit(sprites.sprite(0, 0), self.x,
-                          self.gap_y + self.gap_height + 48, 24, -24)
+        screen.blit(Obstacle.column(self.gap_height), self.x, self.gap_y - PIPE_HEIGHT)
+
+
+# fill the pool up front so spawning never allocates
+Obstacle.pool = [Obstacle() for _ in range(POOL_SIZE)]
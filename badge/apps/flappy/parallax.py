@@ -0,0 +1,53 @@
+from badgeware import Image, brushes, shapes, screen
+
+
+class Layer:
+    # one scrolling layer of the background. the image is repeated every
+    # `period` pixels and scrolls one pixel for every `divisor` steps of the
+    # background offset
+    def __init__(self, image, y, divisor, period=None):
+        self.y = y
+        self.divisor = divisor
+        self.period = period or image.width
+
+        # pre-tile the layer into a strip one period wider than the screen, so
+        # any scroll position is a single blit of it
+        tiles = (screen.width + self.period - 1) // self.period + 1
+        self.strip = Image(0, 0, tiles * self.period, image.height)
+        for i in range(tiles):
+            self.strip.blit(image, i * self.period, 0)
+
+    def position(self, offset):
+        # x to blit the strip at for this background offset (whole pixels)
+        return -((offset // self.divisor) % self.period)
+
+
+class Parallax:
+    # composites the sky and all layers into one screen sized image, which is
+    # only rebuilt on frames where a layer has scrolled to a new pixel.
+    # every other frame the background is a single blit
+    def __init__(self, sky_color, layers):
+        self.sky = brushes.color(*sky_color)
+        self.layers = layers
+        self.positions = [None] * len(layers)
+        self.image = Image(0, 0, screen.width, screen.height)
+
+    def draw(self, offset):
+        changed = False
+        for i in range(len(self.layers)):
+            x = self.layers[i].position(offset)
+            if x != self.positions[i]:
+                self.positions[i] = x
+                changed = True
+
+        if changed:
+            self.compose()
+        screen.blit(self.image, 0, 0)
+
+    def compose(self):
+        image = self.image
+        image.brush = self.sky
+        image.draw(shapes.rectangle(0, 0, screen.width, screen.height))
+        for i in range(len(self.layers)):
+            layer = self.layers[i]
+            image.blit(layer.strip, self.positions[i], layer.y)
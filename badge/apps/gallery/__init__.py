@@ -3,31 +3,47 @@ import os
 
 sys.path.insert(0, "/system/apps/gallery")
 os.chdir("/system/apps/gallery")
+sys.path.append("/system/lib")
 
 import math
 from badgeware import SpriteSheet, PixelFont, Image, screen, run, io, brushes, shapes
+from variants import VariantCache
+import indexer
 
 mona = SpriteSheet("/system/assets/mona-sprites/mona-heart.png", 14, 1).animation()
+mona_variants = VariantCache(36 * 1024)  # every frame, mirrored
 screen.font = PixelFont.load("/system/assets/fonts/nope.ppf")
 screen.antialias = Image.X2
 
 ui_hidden = False
 
-# create a dictionary of all the images in the images directory
-files = []
-for file in os.listdir("images"):
-    file = file.rsplit("/", 1)[-1]
-    name, ext = file.rsplit(".", 1)
-    if ext == "png":
-        files.append({
-            "name": file,
-            "title": name.replace("-", " ")
-        })
-
-# load the thumbnail images to match
-thumbnails = []
-for file in files:
-    thumbnails.append(Image.load(f"thumbnails/{file["name"]}"))
+# the images come from the saved index, which is checked against the images
+# directory in the background, making thumbnails for new or changed images
+INDEX_BUDGET = 4  # ms of indexing per frame
+files = indexer.load()
+index_scan = indexer.Indexer(files)
+index_removals = 0
+files_count = len(files)
+
+# shown for an image that doesn't have a thumbnail (yet) or can't be read
+placeholder = Image(0, 0, 30, 23)
+placeholder.brush = brushes.color(60, 60, 60)
+placeholder.draw(shapes.rectangle(0, 0, 30, 23))
+
+# thumbnails are loaded as they scroll into view and dropped once they're
+# well out of it. only the visible strip plus THUMBNAIL_MARGIN either side
+# is ever kept, and the margin is filled ahead of time one per frame
+THUMBNAIL_REACH = 3  # thumbnails drawn either side of the current one
+THUMBNAIL_MARGIN = 2
+thumbnails = {}  # gallery index -> thumbnail image
+thumbnails_centre = None
+thumbnails_wanted = []
+
+# the images either side of the current one are decoded ahead of time, so
+# switching to one is just a swap. after a switch the new neighbour is only
+# decoded once the thumbnail strip has finished scrolling, so the decode
+# never stalls the scroll
+decoded = {}  # gallery index -> image, the current image and its neighbours
 
 # given a gallery image index it clamps it into the range of available images
 
@@ -35,13 +51,111 @@ for file in files:
 def clamp_index(index):
     return index % len(files)
 
+# decode a gallery image, one deleted since it was indexed shows as the
+# placeholder until the scan drops it
+
+
+def decode(index):
+    try:
+        return Image.load(f"images/{files[index]['name']}")
+    except OSError:
+        return placeholder
+
 # load the main image based on the gallery index provided
 
 
 def load_image(index):
-    global image
+    global image, image_name
     index = clamp_index(index)
-    image = Image.load(f"images/{files[index]["name"]}")
+    image_name = files[index]["name"]
+    image = decoded.get(index)
+    if image is None:
+        image = decode(index)
+
+    # keep only the image and its neighbours
+    neighbours = (index, clamp_index(index - 1), clamp_index(index + 1))
+    for cached in list(decoded):
+        if cached not in neighbours:
+            del decoded[cached]
+    decoded[index] = image
+
+# decode a missing neighbour of the current image, at most one per call
+
+
+def prefetch_images():
+    for neighbour in (clamp_index(index + 1), clamp_index(index - 1)):
+        if neighbour not in decoded:
+            decoded[neighbour] = decode(neighbour)
+            return
+
+# return the thumbnail for a gallery index, loading it if it isn't cached
+
+
+def get_thumbnail(index):
+    thumbnail_image = thumbnails.get(index)
+    if thumbnail_image is None:
+        try:
+            thumbnail_image = Image.load(f"thumbnails/{files[index]['name']}")
+        except OSError:
+            thumbnail_image = placeholder
+        thumbnails[index] = thumbnail_image
+    return thumbnail_image
+
+# keep the cache to the thumbnails around the scroll position
+
+
+def update_thumbnails():
+    global thumbnails_centre, thumbnails_wanted
+
+    centre = int(thumbnail_scroll)
+    if centre != thumbnails_centre:
+        thumbnails_centre = centre
+        reach = THUMBNAIL_REACH + THUMBNAIL_MARGIN
+        thumbnails_wanted = [clamp_index(centre + i) for i in range(-reach, reach + 1)]
+        for cached in list(thumbnails):
+            if cached not in thumbnails_wanted:
+                del thumbnails[cached]
+
+    # prefetch one missing thumbnail per frame
+    for wanted in thumbnails_wanted:
+        if wanted not in thumbnails:
+            get_thumbnail(wanted)
+            break
+
+# run the background index scan and keep the caches in step with it. a new
+# thumbnail only replaces its own cached one, images being dropped moves the
+# rest along so the caches start over, staying on the current image
+
+
+def update_index():
+    global index, thumbnail_scroll, index_removals, files_count, thumbnails_centre
+    index_scan.step(INDEX_BUDGET)
+
+    removed = index_removals != index_scan.removals
+    if removed:
+        index_removals = index_scan.removals
+        thumbnails.clear()
+        decoded.clear()
+
+    for name in index_scan.made:
+        for cached in list(thumbnails):
+            if files[cached]["name"] == name:
+                del thumbnails[cached]
+    index_scan.made.clear()
+
+    # index counts presses either way and is only wrapped by clamp_index, so
+    # once the list changes length it's put back on the image being shown
+    if removed or files_count != len(files):
+        files_count = len(files)
+        thumbnails_centre = None
+        names = [file["name"] for file in files]
+        if image_name in names:
+            index = names.index(image_name)
+            decoded[index] = image
+        else:
+            index = clamp_index(index)
+            load_image(index)
+        thumbnail_scroll = index
 
 # render the thumbnail strip
 
@@ -52,14 +166,14 @@ def draw_thumbnails():
 
     spacing = 36
     # render the thumbnail strip
-    for i in range(-3, 4):
+    for i in range(-THUMBNAIL_REACH, THUMBNAIL_REACH + 1):
         offset = thumbnail_scroll - int(thumbnail_scroll)
 
         pos = (((i + -offset) * spacing) + 60, 92)
 
         # determine which gallery image we're drawing the thumbnail for
         thumbnail = clamp_index(int(thumbnail_scroll) + i)
-        thumbnail_image = thumbnails[thumbnail]
+        thumbnail_image = get_thumbnail(thumbnail)
 
         # draw the thumbnail shadow
         screen.brush = brushes.color(0, 0, 0, 50)
@@ -79,7 +193,8 @@ def draw_thumbnails():
     # draw a jumping mona
     mona_off = abs(((thumbnail_scroll - int(thumbnail_scroll)) * math.pi))
     mona_y = math.sin(mona_off) * 20
-    screen.scale_blit(mona.frame(io.ticks / 100), 130, 68 - mona_y, -24, 24)
+    frame = int(io.ticks / 100) % 14
+    screen.blit(mona_variants.get(frame, mona.frame(frame), -24, 24), 130, 68 - mona_y)
 
 
 # start up with the first image in the gallery
@@ -123,8 +238,15 @@ def update():
         thumbnail_scroll = max(thumbnail_scroll - 0.1, index)
 
     # draw the thumbnail ui
+    update_thumbnails()
     draw_thumbnails()
 
+    # once the strip has settled, get the neighbouring images ready and
+    # carry on indexing
+    if thumbnail_scroll == index:
+        prefetch_images()
+        update_index()
+
     title = files[clamp_index(index)]["title"]
     width, _ = screen.measure_text(title)
 
@@ -0,0 +1,181 @@
+"""Index of the gallery's images, kept up to date in the background.
+
+The gallery starts from INDEX_FILE, a list of the images with their titles,
+sizes and the file size and mtime they had when indexed, so it doesn't have
+to list and parse the images directory before the first frame. An Indexer
+then checks the directory a step at a time from the frame loop: an image
+that is new, or whose size or mtime changed, or that has no thumbnail, gets
+one made by thumbnailer.py. Images that have gone are dropped from the
+index once the scan finishes, and the index is saved if anything changed.
+
+Copying in a lot of images at once is quicker to index on a computer:
+
+    python badge/apps/gallery/indexer.py [gallery directory]
+
+makes the thumbnails and the index in one go, ready to copy to the badge.
+"""
+import os
+import sys
+import time
+import json
+
+import thumbnailer
+
+INDEX_FILE = "index.json"
+IMAGES = "images"
+THUMBNAILS = "thumbnails"
+
+
+def ticks_ms():
+    # MicroPython has ticks_ms, CPython has perf_counter
+    if hasattr(time, "ticks_ms"):
+        return time.ticks_ms()
+    return int(time.perf_counter() * 1000)
+
+
+def ticks_diff(end, start):
+    # ticks_ms wraps on MicroPython
+    if hasattr(time, "ticks_diff"):
+        return time.ticks_diff(end, start)
+    return end - start
+
+
+def exists(path):
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
+
+
+def image_size(path):
+    try:
+        return thumbnailer.png_size(path)
+    except (OSError, ValueError):
+        return 0, 0
+
+
+def entry(file):
+    name = file.rsplit(".", 1)[0]
+    return {"name": file, "title": name.replace("-", " ")}
+
+
+def list_images():
+    files = []
+    for file in os.listdir(IMAGES):
+        file = file.rsplit("/", 1)[-1]
+        if file.endswith(".png"):
+            files.append(file)
+    return files
+
+
+def load():
+    """The indexed images, or a quick listing if there's no index yet"""
+    try:
+        with open(INDEX_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return [entry(file) for file in list_images()]
+
+
+def save(files):
+    with open(INDEX_FILE, "w") as f:
+        json.dump(files, f)
+
+
+class Indexer:
+    def __init__(self, files):
+        self.files = files  # shared with the gallery and updated in place
+        self.job = self.scan()
+        self.done = False
+        self.made = []  # names of images given a new thumbnail, for the gallery to take
+        self.removals = 0  # bumped when images are dropped from the list
+
+    def step(self, budget):
+        """Scan for up to budget ms, returns true once the scan has finished"""
+        if self.done:
+            return True
+        start = ticks_ms()
+        try:
+            while ticks_diff(ticks_ms(), start) < budget:
+                next(self.job)
+        except StopIteration:
+            self.done = True
+        return self.done
+
+    def scan(self):
+        changed = False
+        names = list_images()
+        try:
+            os.mkdir(THUMBNAILS)
+        except OSError:
+            pass
+        yield
+
+        indexed = {}
+        for image in self.files:
+            indexed[image["name"]] = image
+
+        gone = set()
+        for name in names:
+            source = f"{IMAGES}/{name}"
+            target = f"{THUMBNAILS}/{name}"
+            try:
+                stat = os.stat(source)
+            except OSError:
+                # deleted since the listing, dropped with the others at the end
+                gone.add(name)
+                yield
+                continue
+            image = indexed.get(name)
+            if image is None:
+                image = entry(name)
+                self.files.append(image)
+                indexed[name] = image
+
+            if "size" not in image and exists(target):
+                # indexed for the first time, keep the thumbnail it came with
+                width, height = image_size(source)
+                image["thumbnail"] = True
+            elif ("size" in image and image["size"] == stat[6] and image["mtime"] == stat[8] and
+                  (not image["thumbnail"] or exists(target))):
+                yield
+                continue
+            else:
+                try:
+                    width, height = yield from thumbnailer.thumbnail(source, target)
+                    image["thumbnail"] = True
+                except (OSError, ValueError):
+                    # can't read it, the gallery shows it without a thumbnail
+                    width, height = image_size(source)
+                    image["thumbnail"] = False
+                self.made.append(name)
+
+            image["width"] = width
+            image["height"] = height
+            image["size"] = stat[6]
+            image["mtime"] = stat[8]
+            changed = True
+            yield
+
+        present = set(names) - gone
+        if len(present) != len(self.files):
+            self.files[:] = [image for image in self.files if image["name"] in present]
+            self.removals += 1
+            changed = True
+
+        if changed:
+            save(self.files)
+
+
+def main(path="."):
+    os.chdir(path)
+    indexer = Indexer(load())
+    thumbnailer.finish(indexer.job)
+    for image in indexer.files:
+        made = "" if image.get("thumbnail") else " (no thumbnail)"
+        print(f"{image['name']:<32} {image['width']}x{image['height']}{made}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(__file__) or ".")
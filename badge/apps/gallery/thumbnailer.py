@@ -0,0 +1,289 @@
+"""Make gallery thumbnails from PNG images without any image library.
+
+The badge can decode PNGs but not write them, so this reads the PNG itself,
+shrinks it with a box filter while unfiltering its rows, and writes the
+thumbnail as an uncompressed PNG (a thumbnail is only a couple of KB).
+
+`thumbnail()` is a generator that yields after each row of the source image,
+so the gallery can spread the work over frames. The image data is read and
+inflated a row at a time as well, so no step has to take in the whole file.
+Run it to the end with `finish()` when there's no frame to keep smooth (the
+host batch mode in indexer.py).
+
+Only 8-bit, non-interlaced PNGs are supported, which covers the usual
+exports. Anything else raises ValueError.
+"""
+import io
+import struct
+
+try:
+    import deflate
+
+    def inflater(stream):
+        return deflate.DeflateIO(stream, deflate.ZLIB)
+except ImportError:
+    import zlib
+
+    class inflater:
+        # the part of DeflateIO used here, for CPython
+        def __init__(self, stream):
+            self.stream = stream
+            self.zlib = zlib.decompressobj()
+            self.buffer = b""
+
+        def read(self, n):
+            while len(self.buffer) < n:
+                data = self.stream.read(4096)
+                if not data:
+                    break
+                self.buffer += self.zlib.decompress(data)
+            data, self.buffer = self.buffer[:n], self.buffer[n:]
+            return data
+
+try:
+    from binascii import crc32
+except ImportError:
+    crc32 = None
+
+THUMBNAIL_WIDTH = 30
+THUMBNAIL_HEIGHT = 23
+
+SIGNATURE = b"\x89PNG\r\n\x1a\n"
+CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}  # by png colour type
+
+CRC_TABLE = None
+
+
+def png_crc(data):
+    global CRC_TABLE
+    if crc32 is not None:
+        return crc32(data) & 0xFFFFFFFF
+    if CRC_TABLE is None:
+        CRC_TABLE = []
+        for n in range(256):
+            c = n
+            for _ in range(8):
+                c = (0xEDB88320 ^ (c >> 1)) if c & 1 else c >> 1
+            CRC_TABLE.append(c)
+    c = 0xFFFFFFFF
+    for byte in data:
+        c = CRC_TABLE[(c ^ byte) & 0xFF] ^ (c >> 8)
+    return c ^ 0xFFFFFFFF
+
+
+def adler32(data):
+    a, b = 1, 0
+    for byte in data:
+        a = (a + byte) % 65521
+        b = (b + a) % 65521
+    return (b << 16) | a
+
+
+def png_size(path):
+    """(width, height) from a PNG's header"""
+    with open(path, "rb") as f:
+        header = f.read(24)
+    if header[:8] != SIGNATURE:
+        raise ValueError("not a png")
+    return struct.unpack(">II", header[16:24])
+
+
+class Idat(io.IOBase):
+    """Stream of the compressed image data of an open PNG, across its IDAT chunks"""
+
+    def __init__(self, f, length):
+        self.f = f
+        self.left = length  # bytes left in the current IDAT chunk
+
+    def read(self, n):
+        while not self.left:
+            if self.left is None:
+                return b""
+            self.f.read(4)  # crc of the chunk just finished
+            length, kind = struct.unpack(">I4s", self.f.read(8))
+            self.left = length if kind == b"IDAT" else None
+        data = self.f.read(min(n, self.left))
+        if not data:
+            raise ValueError("png cut short")
+        self.left -= len(data)
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def read_header(f):
+    # reads an open PNG up to its image data, returns the IHDR fields, the
+    # palette and an Idat stream positioned at the start of the data
+    if f.read(8) != SIGNATURE:
+        raise ValueError("not a png")
+
+    header = None
+    palette = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            raise ValueError("no png image data")
+        length, kind = struct.unpack(">I4s", chunk)
+        if kind == b"IDAT":
+            break
+        body = f.read(length)
+        f.read(4)
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif kind == b"PLTE":
+            palette = body
+
+    if header is None:
+        raise ValueError("no png header")
+    width, height, depth, colour, _, _, interlace = header
+    if depth != 8 or interlace or colour not in CHANNELS or (colour == 3 and not palette):
+        raise ValueError("unsupported png")
+    return width, height, colour, palette, Idat(f, length)
+
+
+def read_row(data, size):
+    # DeflateIO can return short reads, keep going until the row is whole
+    row = bytearray(data.read(size))
+    while len(row) < size:
+        more = data.read(size - len(row))
+        if not more:
+            raise ValueError("png cut short")
+        row.extend(more)
+    return row
+
+
+def unfilter(row, previous, kind, bpp):
+    # undo the png filter of one row in place, previous is the row above
+    n = len(row)
+    if kind == 1:  # sub
+        for x in range(bpp, n):
+            row[x] = (row[x] + row[x - bpp]) & 0xFF
+    elif kind == 2:  # up
+        for x in range(n):
+            row[x] = (row[x] + previous[x]) & 0xFF
+    elif kind == 3:  # average
+        for x in range(n):
+            left = row[x - bpp] if x >= bpp else 0
+            row[x] = (row[x] + ((left + previous[x]) >> 1)) & 0xFF
+    elif kind == 4:  # paeth
+        for x in range(n):
+            a = row[x - bpp] if x >= bpp else 0
+            b = previous[x]
+            c = previous[x - bpp] if x >= bpp else 0
+            p = a + b - c
+            pa = abs(p - a)
+            pb = abs(p - b)
+            pc = abs(p - c)
+            if pa <= pb and pa <= pc:
+                predictor = a
+            elif pb <= pc:
+                predictor = b
+            else:
+                predictor = c
+            row[x] = (row[x] + predictor) & 0xFF
+    elif kind:
+        raise ValueError("bad png filter")
+
+
+def write_png(path, width, height, rgb):
+    # rgb is width * height * 3 bytes, stored with no filter or compression
+    stride = width * 3
+    raw = bytearray()
+    for y in range(height):
+        raw.append(0)
+        raw.extend(rgb[y * stride:(y + 1) * stride])
+
+    # zlib stream of stored deflate blocks
+    stream = bytearray(b"\x78\x01")
+    for start in range(0, len(raw), 65535):
+        block = raw[start:start + 65535]
+        final = 1 if start + 65535 >= len(raw) else 0
+        stream.append(final)
+        stream.extend(struct.pack("<HH", len(block), len(block) ^ 0xFFFF))
+        stream.extend(block)
+    stream.extend(struct.pack(">I", adler32(raw)))
+
+    with open(path, "wb") as f:
+        f.write(SIGNATURE)
+        for kind, body in ((b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+                           (b"IDAT", stream), (b"IEND", b"")):
+            f.write(struct.pack(">I", len(body)))
+            f.write(kind)
+            f.write(body)
+            f.write(struct.pack(">I", png_crc(kind + body)))
+
+
+def thumbnail(source, target, max_width=THUMBNAIL_WIDTH, max_height=THUMBNAIL_HEIGHT):
+    """Generator writing a thumbnail of source to target, returns the source size"""
+    with open(source, "rb") as f:
+        size = yield from shrink(f, target, max_width, max_height)
+    return size
+
+
+def shrink(f, target, max_width, max_height):
+    width, height, colour, palette, idat = read_header(f)
+    data = inflater(idat)
+    yield
+
+    scale = min(max_width / width, max_height / height)
+    out_width = max(1, int(width * scale + 0.5))
+    out_height = max(1, int(height * scale + 0.5))
+
+    bpp = CHANNELS[colour]
+    stride = width * bpp
+    columns = bytes([x * out_width // width for x in range(width)])
+
+    sums = [0] * (out_width * 3)
+    counts = [0] * out_width
+    rgb = bytearray(out_width * out_height * 3)
+    previous = bytearray(stride)
+    out_y = 0
+
+    for y in range(height):
+        kind = read_row(data, 1)[0]
+        row = read_row(data, stride)
+        unfilter(row, previous, kind, bpp)
+        previous = row
+
+        # add the row's pixels to the boxes of the output row
+        for x in range(width):
+            i = x * bpp
+            if colour == 2 or colour == 6:
+                r, g, b = row[i], row[i + 1], row[i + 2]
+            elif colour == 3:
+                p = row[i] * 3
+                r, g, b = palette[p], palette[p + 1], palette[p + 2]
+            else:
+                r = g = b = row[i]
+            ox = columns[x]
+            sums[ox * 3] += r
+            sums[ox * 3 + 1] += g
+            sums[ox * 3 + 2] += b
+            counts[ox] += 1
+
+        # the last source row of an output row, average the boxes into it
+        if y == height - 1 or (y + 1) * out_height // height != out_y:
+            base = out_y * out_width * 3
+            for ox in range(out_width):
+                n = counts[ox] or 1
+                for c in range(3):
+                    rgb[base + ox * 3 + c] = sums[ox * 3 + c] // n
+                    sums[ox * 3 + c] = 0
+                counts[ox] = 0
+            out_y += 1
+        yield
+
+    write_png(target, out_width, out_height, rgb)
+    return width, height
+
+
+def finish(job):
+    """Run a generator job to the end, returning its result"""
+    try:
+        while True:
+            next(job)
+    except StopIteration as done:
+        return done.value
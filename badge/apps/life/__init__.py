@@ -1,5 +1,16 @@
+import sys
+import os
+
+sys.path.insert(0, "/system/apps/life")
+os.chdir("/system/apps/life")
+sys.path.append("/system/lib")
+
 from badgeware import screen, PixelFont, shapes, brushes, io, run, Matrix
 import random
+import gc
+from hashlife import Universe
+from cellgrid import CellGrid
+from fixedstep import FixedStep
 
 # GitHub contribution graph colors (dark mode) - based on neighbor count
 NEIGHBOR_COLORS = [
@@ -32,8 +43,8 @@ GRID_HEIGHT = 30  # 120 / 4
 # Load font
 small_font = PixelFont.load("/system/assets/fonts/nope.ppf")
 
-# Pre-create shape for cells (reused for all cells)
-cell_rect = shapes.rectangle(0, 0, SQUARE_SIZE, SQUARE_SIZE)
+# Palette index 0 is a dead cell, 1 + n a live cell with n neighbours
+grid = CellGrid(GRID_WIDTH, GRID_HEIGHT, [BACKGROUND_COLOR] + NEIGHBOR_COLORS, GRID_SIZE, GRID_SIZE - SQUARE_SIZE)
 
 # Interesting Life patterns (name, pattern as list of (x, y) offsets)
 PATTERNS = {
@@ -63,62 +74,163 @@ PATTERNS = {
     'acorn': [(1, 0), (3, 1), (0, 2), (1, 2), (4, 2), (5, 2), (6, 2)],  # Takes 5206 generations to stabilize
 }
 
+# Each column of the grid is packed into one int, bit y = row y. Packing by
+# column keeps every word within 30 bits so it stays a MicroPython small int.
+COLUMN_MASK = (1 << GRID_HEIGHT) - 1
+LOW_MASK = COLUMN_MASK >> 1
+
+# Recent states kept for spotting short-period oscillators straight away
+HISTORY_SIZE = 16
+
+# State hashes are 30 bits wide so hashing never allocates on MicroPython
+HASH_HIGH = 25  # rotate the running hash left by 30 - HASH_HIGH bits per column
+HASH_LOW_MASK = (1 << HASH_HIGH) - 1
+
+# Patterns injected when the board stagnates, weighted towards the interesting ones
+PATTERN_POOL = [
+    'glider', 'glider', 'glider',  # 3x weight
+    'lwss', 'lwss', 'lwss',  # 3x weight
+    'blinker',
+    'toad',
+    'beacon',
+    'pulsar', 'pulsar',  # 2x weight
+    'r_pentomino', 'r_pentomino',  # 2x weight
+    'acorn'
+]
+
+def roll_down(c):
+    """Move each cell one row down (bit y -> y + 1), wrapping the bottom row to the top"""
+    return ((c & LOW_MASK) << 1) | (c >> (GRID_HEIGHT - 1))
+
+def roll_up(c):
+    """Move each cell one row up (bit y -> y - 1), wrapping the top row to the bottom"""
+    return (c >> 1) | ((c & 1) << (GRID_HEIGHT - 1))
+
 class GameOfLife:
     def __init__(self):
-        self.grid = [[False for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-        self.next_grid = [[False for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-        self.neighbor_counts = [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+        self.columns = [0] * GRID_WIDTH
+        # Neighbour counts as four bit planes per column (count = n0 + 2*n1 + 4*n2 + 8*n3)
+        self.n0 = [0] * GRID_WIDTH
+        self.n1 = [0] * GRID_WIDTH
+        self.n2 = [0] * GRID_WIDTH
+        self.n3 = [0] * GRID_WIDTH
+        # Scratch per-column sums of the three cells (t) and the two vertical neighbours (p)
+        self.t0 = [0] * GRID_WIDTH
+        self.t1 = [0] * GRID_WIDTH
+        self.p0 = [0] * GRID_WIDTH
+        self.p1 = [0] * GRID_WIDTH
         self.generation = 0
-        self.last_update = 0
-        self.update_interval = 200  # milliseconds
-        self.history = []  # Store recent grid states for pattern detection
-        self.history_size = 10  # Check last 10 states
+        # Generations run at a fixed rate; a slow frame never queues up more than one
+        self.clock = FixedStep(1000 / 200, max_steps=1)
+        self.turbo = 1  # generations per update
+        self.redraw = True  # the grid has changed since it was last drawn
+        self.hash = 0  # Rolling hash of the current columns
+        # Ring buffer of recent states (hashes plus the full columns to verify hash hits)
+        self.history_hashes = [0] * HISTORY_SIZE
+        self.history_states = [0] * (HISTORY_SIZE * GRID_WIDTH)
+        self.history_len = 0
+        self.history_pos = 0
+        # Brent's cycle detection: a checkpoint state that moves at power-of-two steps
+        self.brent_hash = 0
+        self.brent_state = [0] * GRID_WIDTH
+        self.brent_power = 1
+        self.brent_lam = 0
+        self.cycling = False  # A state has repeated, so the board is stuck in a loop
         self.stagnant_count = 0  # How many generations have been static/oscillating
         self.randomize()
     
     def randomize(self):
         """Initialize grid with random cells"""
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                self.grid[y][x] = random.random() < 0.35  # 35% chance of being alive
+        for x in range(GRID_WIDTH):
+            column = 0
+            for y in range(GRID_HEIGHT):
+                if random.random() < 0.35:  # 35% chance of being alive
+                    column |= 1 << y
+            self.columns[x] = column
         self.generation = 0
-        self.history = []
-        self.stagnant_count = 0
+        self.reset_history()
         self.calculate_neighbors()
     
+    def is_alive(self, x, y):
+        return (self.columns[x % GRID_WIDTH] >> (y % GRID_HEIGHT)) & 1
+    
     def count_neighbors(self, x, y):
         """Count alive neighbors for a given cell position"""
-        y_prev = (y - 1) % GRID_HEIGHT
-        y_next = (y + 1) % GRID_HEIGHT
-        x_prev = (x - 1) % GRID_WIDTH
-        x_next = (x + 1) % GRID_WIDTH
-        
-        count = 0
-        if self.grid[y_prev][x_prev]: count += 1
-        if self.grid[y_prev][x]: count += 1
-        if self.grid[y_prev][x_next]: count += 1
-        if self.grid[y][x_prev]: count += 1
-        if self.grid[y][x_next]: count += 1
-        if self.grid[y_next][x_prev]: count += 1
-        if self.grid[y_next][x]: count += 1
-        if self.grid[y_next][x_next]: count += 1
-        
-        return count
+        x %= GRID_WIDTH
+        y %= GRID_HEIGHT
+        return (((self.n0[x] >> y) & 1) | (((self.n1[x] >> y) & 1) << 1) |
+                (((self.n2[x] >> y) & 1) << 2) | (((self.n3[x] >> y) & 1) << 3))
     
     def get_grid_hash(self):
-        """Create a hashable representation of current grid state"""
-        return tuple(tuple(row) for row in self.grid)
+        """Hash the current grid state into a 30-bit int"""
+        h = 0
+        for column in self.columns:
+            h = (((h & HASH_LOW_MASK) << (GRID_HEIGHT - HASH_HIGH)) | (h >> HASH_HIGH)) ^ column
+        return h
+    
+    def reset_history(self):
+        """Forget past states, after the grid has been changed from outside the rules"""
+        self.hash = self.get_grid_hash()
+        self.history_len = 0
+        self.history_pos = 0
+        self.brent_hash = self.hash
+        self.copy_state(self.brent_state, 0)
+        self.brent_power = 1
+        self.brent_lam = 0
+        self.cycling = False
+        self.stagnant_count = 0
+    
+    def copy_state(self, target, offset):
+        columns = self.columns
+        for x in range(GRID_WIDTH):
+            target[offset + x] = columns[x]
+    
+    def same_state(self, states, offset):
+        columns = self.columns
+        for x in range(GRID_WIDTH):
+            if states[offset + x] != columns[x]:
+                return False
+        return True
     
     def is_stagnant(self):
-        """Check if grid is static or oscillating"""
-        current = self.get_grid_hash()
+        """Check if grid is static or oscillating.
+        
+        Recent states are checked by hash first and only compared in full on a
+        hit. Longer loops (like a glider circling the torus) are caught by
+        Brent's algorithm. The rules are deterministic, so once any state
+        repeats the board stays stagnant until it is changed.
+        """
+        if self.cycling:
+            return True
         
-        # Check if current state matches any recent state
-        for old_state in self.history:
-            if current == old_state:
+        current = self.hash
+        for i in range(self.history_len):
+            if self.history_hashes[i] == current and self.same_state(self.history_states, i * GRID_WIDTH):
+                self.cycling = True
                 return True
+        
+        if self.brent_hash == current and self.same_state(self.brent_state, 0):
+            self.cycling = True
+            return True
+        
+        # Move the checkpoint forward at doubling intervals
+        self.brent_lam += 1
+        if self.brent_lam == self.brent_power:
+            self.brent_hash = current
+            self.copy_state(self.brent_state, 0)
+            self.brent_power *= 2
+            self.brent_lam = 0
         return False
     
+    def remember(self):
+        """Add the current state to the ring buffer of recent states"""
+        pos = self.history_pos
+        self.history_hashes[pos] = self.hash
+        self.copy_state(self.history_states, pos * GRID_WIDTH)
+        self.history_pos = (pos + 1) % HISTORY_SIZE
+        if self.history_len < HISTORY_SIZE:
+            self.history_len += 1
+    
     def inject_pattern(self, pattern_name):
         """Inject an interesting pattern at a random location"""
         pattern = PATTERNS[pattern_name]
@@ -135,113 +247,288 @@ class GameOfLife:
         for dx, dy in pattern:
             x = (start_x + dx) % GRID_WIDTH
             y = (start_y + dy) % GRID_HEIGHT
-            self.grid[y][x] = True
+            self.columns[x] |= 1 << y
         
         # Reset stagnancy tracking
-        self.history = []
-        self.stagnant_count = 0
+        self.reset_history()
+        self.calculate_neighbors()
+    
+    def step(self):
+        """Advance one generation using the neighbour counts of the current one"""
+        columns = self.columns
+        n0, n1, n2, n3 = self.n0, self.n1, self.n2, self.n3
+        h = 0
+        for x in range(GRID_WIDTH):
+            # Born with 3 neighbours, survives with 2 or 3
+            column = n1[x] & ~n2[x] & ~n3[x] & (n0[x] | columns[x])
+            columns[x] = column
+            # Hash as we go (same as get_grid_hash)
+            h = (((h & HASH_LOW_MASK) << (GRID_HEIGHT - HASH_HIGH)) | (h >> HASH_HIGH)) ^ column
+        self.hash = h
+        self.generation += 1
         self.calculate_neighbors()
     
     def update(self):
         """Apply Conway's Game of Life rules"""
-        # First pass: count neighbors and apply rules
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                # Count neighbors using helper method
-                count = self.count_neighbors(x, y)
-                
-                # Apply Conway's rules
-                is_alive = self.grid[y][x]
-                
-                # Optimized rules check
-                if is_alive:
-                    self.next_grid[y][x] = (count == 2 or count == 3)
-                else:
-                    self.next_grid[y][x] = (count == 3)
-        
-        # Swap grids (avoid allocation)
-        self.grid, self.next_grid = self.next_grid, self.grid
-        self.generation += 1
-        
-        # Check for stagnation and inject patterns if needed
-        if self.is_stagnant():
-            self.stagnant_count += 1
-            if self.stagnant_count >= 5:  # If stagnant for 5+ generations
-                # Choose a random interesting pattern with weights
-                # More likely to pick gliders, spaceships, and interesting patterns
-                pattern_pool = [
-                    'glider', 'glider', 'glider',  # 3x weight
-                    'lwss', 'lwss', 'lwss',  # 3x weight
-                    'blinker',
-                    'toad',
-                    'beacon',
-                    'pulsar', 'pulsar',  # 2x weight
-                    'r_pentomino', 'r_pentomino',  # 2x weight
-                    'acorn'
-                ]
-                pattern = random.choice(pattern_pool)
-                self.inject_pattern(pattern)
-        else:
-            self.stagnant_count = 0
-        
-        # Update history for pattern detection
-        self.history.append(self.get_grid_hash())
-        if len(self.history) > self.history_size:
-            self.history.pop(0)
-        
-        # Second pass: calculate neighbor counts for the NEW grid state (for coloring)
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                self.neighbor_counts[y][x] = self.count_neighbors(x, y)
+        for _ in range(self.turbo):
+            self.step()
+            
+            # Check for stagnation and inject patterns if needed
+            if self.is_stagnant():
+                self.stagnant_count += 1
+                if self.stagnant_count >= 5:  # If stagnant for 5+ generations
+                    # Choose a random interesting pattern with weights
+                    pattern = random.choice(PATTERN_POOL)
+                    self.inject_pattern(pattern)
+            else:
+                self.stagnant_count = 0
+            
+            # Update history for pattern detection
+            self.remember()
     
     def calculate_neighbors(self):
-        """Calculate neighbor counts for all cells (used only on init)"""
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                self.neighbor_counts[y][x] = self.count_neighbors(x, y)
+        """Bit-sliced neighbour counts for every cell of the current grid.
+        
+        Each column is summed with its vertical neighbours by a full adder
+        (t = up + self + down, p = up + down), then the 8-neighbour count of a
+        column is t[x - 1] + p[x] + t[x + 1], added bitwise across all 30 rows at once.
+        """
+        columns = self.columns
+        t0, t1, p0, p1 = self.t0, self.t1, self.p0, self.p1
+        for x in range(GRID_WIDTH):
+            c = columns[x]
+            u = roll_down(c)
+            d = roll_up(c)
+            p0[x] = u ^ d
+            p1[x] = u & d
+            t0[x] = p0[x] ^ c
+            t1[x] = p1[x] | (p0[x] & c)
+        
+        n0, n1, n2, n3 = self.n0, self.n1, self.n2, self.n3
+        self.redraw = True
+        for x in range(GRID_WIDTH):
+            l = x - 1  # index -1 wraps to the last column
+            r = x + 1 if x < GRID_WIDTH - 1 else 0
+            # left + right triples (0..6)
+            a0, a1, c0, c1 = t0[l], t1[l], t0[r], t1[r]
+            s0 = a0 ^ c0
+            k = a0 & c0
+            s1 = a1 ^ c1 ^ k
+            s2 = (a1 & c1) | (k & (a1 ^ c1))
+            # + own column's vertical pair (0..2)
+            b0, b1 = p0[x], p1[x]
+            n0[x] = s0 ^ b0
+            k = s0 & b0
+            n1[x] = s1 ^ b1 ^ k
+            k = (s1 & b1) | (k & (s1 ^ b1))
+            n2[x] = s2 ^ k
+            n3[x] = s2 & k
     
     def draw(self):
         """Draw the grid with colors based on neighbor count"""
-        # Use pre-created shape and brushes for performance
-        for y in range(GRID_HEIGHT):
-            py = y * GRID_SIZE
+        if self.redraw:
+            self.redraw = False
+            cells = grid.cells
             for x in range(GRID_WIDTH):
-                if self.grid[y][x]:
-                    # Alive cells - color based on neighbor count
-                    neighbors = self.neighbor_counts[y][x]
-                    screen.brush = NEIGHBOR_BRUSHES[neighbors]
-                    cell_rect.transform = Matrix().translate(x * GRID_SIZE, py)
-                    screen.draw(cell_rect)
+                column = self.columns[x]
+                c0, c1, c2, c3 = self.n0[x], self.n1[x], self.n2[x], self.n3[x]
+                for i in range(x, len(cells), GRID_WIDTH):
+                    if column & 1:
+                        # Alive cells - color based on neighbor count
+                        cells[i] = 1 + ((c0 & 1) | ((c1 & 1) << 1) | ((c2 & 1) << 2) | ((c3 & 1) << 3))
+                    else:
+                        cells[i] = 0
+                    column >>= 1
+                    c0 >>= 1
+                    c1 >>= 1
+                    c2 >>= 1
+                    c3 >>= 1
+            grid.invalidate()
+        grid.render()
+
+# Large-world mode: patterns run in an unbounded HashLife universe
+WORLD_PATTERNS = ['acorn', 'r_pentomino', 'pulsar', 'lwss']
+WORLD_NODES = 8192  # node cache size, about 180KB of heap
+WORLD_HZ = 10  # steps per second
+ZOOM_MIN = -2  # 4 pixels per cell (like the torus)
+ZOOM_MAX = 8  # 256x256 cells per pixel
+PAN_PIXELS = 4  # screen pixels panned per frame while a button is held
+
+class World:
+    """Viewport onto a HashLife universe.
+    
+    zoom <= 0 draws each cell as a 2^-zoom pixel square, zoom > 0 makes each
+    pixel cover a 2^zoom square of cells.
+    """
+    def __init__(self, pattern=-1):
+        self.universe = Universe(WORLD_NODES)
+        self.pattern = pattern  # index of the last pattern loaded
+        self.clock = FixedStep(WORLD_HZ, max_steps=1)
+    
+    def load_next(self):
+        """Start the universe over with the next pattern"""
+        self.pattern = (self.pattern + 1) % len(WORLD_PATTERNS)
+        name = WORLD_PATTERNS[self.pattern]
+        universe = self.universe
+        universe.clear()
+        for x, y in PATTERNS[name]:
+            universe.set_cell(x, y)
+        universe.set_step_log(0)
+        self.zoom = 0
+        # Centre of the view in world cells
+        pattern = PATTERNS[name]
+        self.x = max(p[0] for p in pattern) // 2
+        self.y = max(p[1] for p in pattern) // 2
+        return name
+    
+    def pan(self, dx, dy):
+        cells = PAN_PIXELS << self.zoom if self.zoom > 0 else max(1, PAN_PIXELS >> -self.zoom)
+        self.x += dx * cells
+        self.y += dy * cells
+    
+    def update(self):
+        if self.clock.steps():
+            self.universe.step()
+    
+    def draw(self):
+        zoom = self.zoom
+        if zoom > 0:
+            self.block_log = zoom
+            self.cell_px = 1
+            width, height = 160 << zoom, 120 << zoom
+            size = 1
+        else:
+            self.block_log = 0
+            self.cell_px = 1 << -zoom
+            width, height = 160 >> -zoom, 120 >> -zoom
+            size = self.cell_px - 1 if self.cell_px >= GRID_SIZE else self.cell_px
+        self.left = self.x - width // 2
+        self.top = self.y - height // 2
+        self.rect = shapes.rectangle(0, 0, size, size)
+        self.universe.blocks(self.left, self.top, width, height, self.block_log, self.draw_block)
+    
+    def draw_block(self, x, y, population):
+        if self.block_log:
+            # Brighter the more of the block is alive
+            shade = 3 + ((5 * population) >> (2 * self.block_log))
+            px, py = (x - self.left) >> self.block_log, (y - self.top) >> self.block_log
+        else:
+            shade = 6
+            px, py = (x - self.left) * self.cell_px, (y - self.top) * self.cell_px
+        screen.brush = NEIGHBOR_BRUSHES[min(shade, 8)]
+        self.rect.transform = Matrix().translate(px, py)
+        screen.draw(self.rect)
+
+# Generations per update selectable with UP/DOWN
+TURBO_LEVELS = [1, 2, 4, 8, 16]
 
 # Game state
 game = GameOfLife()
+world = None  # only allocated while in large-world mode
+world_pattern = -1
+world_mode = False
+b_held = False
+b_combo = False  # B has been used as a modifier since it was pressed
 show_info = False
 info_timer = 0
+info_text = ""
+
+def show_message(text):
+    global show_info, info_timer, info_text
+    show_info = True
+    info_text = text
+    info_timer = io.ticks + 1000  # Show message for 1 second
+
+def update_world():
+    """Input for large-world mode.
+    
+    A/C/UP/DOWN pan, hold B with UP/DOWN to zoom or A/C to change speed,
+    tap B on its own to go back to the torus.
+    """
+    global world, world_pattern, world_mode, b_held, b_combo
+    
+    universe = world.universe
+    if io.BUTTON_B in io.held:
+        if not b_held:
+            b_combo = False
+        if io.BUTTON_UP in io.pressed and world.zoom > ZOOM_MIN:
+            world.zoom -= 1
+            b_combo = True
+        if io.BUTTON_DOWN in io.pressed and world.zoom < ZOOM_MAX:
+            world.zoom += 1
+            b_combo = True
+        if io.BUTTON_A in io.pressed or io.BUTTON_C in io.pressed:
+            change = 1 if io.BUTTON_C in io.pressed else -1
+            universe.set_step_log(universe.step_log + change)
+            show_message(f"{1 << universe.step_log} gens/step")
+            b_combo = True
+    elif b_held and not b_combo:
+        world_mode = False
+        b_held = False
+        # Give the node cache back to the torus
+        world_pattern = world.pattern
+        world = None
+        gc.collect()
+        game.clock.reset()
+        show_message("Torus")
+        return
+    else:
+        dx = (io.BUTTON_C in io.held) - (io.BUTTON_A in io.held)
+        dy = (io.BUTTON_DOWN in io.held) - (io.BUTTON_UP in io.held)
+        if dx or dy:
+            world.pan(dx, dy)
+    b_held = io.BUTTON_B in io.held
+    
+    world.update()
+    world.draw()
 
 def update():
-    global show_info, info_timer
+    global show_info, world, world_mode
     
     # Clear screen with pre-created brush
     screen.brush = BACKGROUND_BRUSH
     screen.clear()
     
+    if world_mode:
+        update_world()
+        draw_message()
+        return
+    
+    # Switch to the large world with the next pattern
+    if io.BUTTON_A in io.pressed:
+        world_mode = True
+        world = World(world_pattern)
+        show_message(world.load_next())
+        return
+    
     # Handle input
     if io.BUTTON_B in io.pressed:
         game.randomize()
-        show_info = True
-        info_timer = io.ticks + 1000  # Show "Regenerated" for 1 second
+        show_message("Regenerated!")
+    
+    # Change how many generations run per update
+    level = TURBO_LEVELS.index(game.turbo)
+    if io.BUTTON_UP in io.pressed and level < len(TURBO_LEVELS) - 1:
+        game.turbo = TURBO_LEVELS[level + 1]
+        show_message(f"Turbo x{game.turbo}")
+    if io.BUTTON_DOWN in io.pressed and level > 0:
+        game.turbo = TURBO_LEVELS[level - 1]
+        show_message(f"Turbo x{game.turbo}")
     
     # Update game logic
-    if io.ticks - game.last_update > game.update_interval:
-        game.last_update = io.ticks
+    if game.clock.steps():
         game.update()
     
     # Draw the grid
     game.draw()
+    draw_message()
+
+def draw_message():
+    global show_info
     
-    # Show regeneration message
+    # Show regeneration / turbo message
     if show_info and io.ticks < info_timer:
-        msg = "Regenerated!"
+        msg = info_text
         w, _ = screen.measure_text(msg)
         # Draw background for text
         screen.brush = INFO_BG_BRUSH
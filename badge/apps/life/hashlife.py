@@ -0,0 +1,408 @@
+"""HashLife universe for the life app's large-world mode.
+
+The world is a quadtree of canonical (hash-consed) nodes, so identical
+regions are stored once and the future of every node is memoised. A node of
+level L is a 2^L square; stepping it returns its centre half advanced by up to
+2^(L-2) generations, which lets big or repetitive patterns run exponentially
+fast.
+
+Nodes live in fixed-size arrays so the cache can't outgrow the badge's heap.
+Node ids 0..15 are the 2x2 level-1 nodes themselves (bit 0 = top left,
+bit 1 = top right, bit 2 = bottom left, bit 3 = bottom right), every bigger
+node is a slot in the arrays with id = slot + 16. When the arrays fill up,
+nodes that the current universe no longer uses are evicted.
+"""
+from array import array
+
+LEAF_IDS = 16  # ids below this are level-1 nodes
+NO_RESULT = 0xFFFF
+
+# The universe stops growing at this level and drops whatever has flown
+# further out (keeps every coordinate a small int)
+MAX_LEVEL = 26
+MAX_STEP_LOG = MAX_LEVEL - 4
+
+# Population of each level-1 node
+LEAF_POP = bytearray([0, 1, 1, 2, 1, 2, 2, 3, 1, 2, 2, 3, 2, 3, 3, 4])
+
+
+def node_hash(a, b, c, d):
+    # Multiply-add kept below 2^30 so it never allocates
+    h = (a * 4093 + b) & 0xFFFFF
+    h = (((h * 613 + c) & 0xFFFFF) * 613 + d) & 0xFFFFF
+    return (h * 613) ^ (h >> 9)
+
+
+class OutOfNodes(Exception):
+    pass
+
+
+class Universe:
+    def __init__(self, max_nodes=8192):
+        # ids must fit in 16 bits
+        self.max_nodes = min(max_nodes, NO_RESULT - LEAF_IDS)
+        n = self.max_nodes
+        self.nw = array("H", bytearray(n * 2))
+        self.ne = array("H", bytearray(n * 2))
+        self.sw = array("H", bytearray(n * 2))
+        self.se = array("H", bytearray(n * 2))
+        self.result = array("H", bytearray(n * 2))
+        self.pop = array("I", bytearray(n * 4))
+        self.level = bytearray(n)
+        self.marks = bytearray(n)
+
+        # Open addressing table of node id + 1 (0 = empty), at most half full
+        size = 1
+        while size < n * 2:
+            size <<= 1
+        self.table = array("H", bytearray(size * 2))
+        self.table_mask = size - 1
+
+        # Stack of free slots
+        self.free = array("H", bytearray(n * 2))
+        self.free_count = 0
+
+        self.step_log = 0  # each step advances 2^step_log generations
+        self.clear()
+
+    def clear(self):
+        """Empty the universe and forget every cached node"""
+        n = self.max_nodes
+        for i in range(n):
+            self.free[i] = n - 1 - i
+            self.level[i] = 0
+        self.free_count = n
+        for i in range(len(self.table)):
+            self.table[i] = 0
+        self.empty = [0, 0]  # empty node of each level (level 0 is unused)
+        self.root = self.empty_node(3)
+        self.root_x = -4  # world position of the root's top left cell
+        self.root_y = -4
+        self.generation = 0
+        self.evictions = 0
+
+    def node_level(self, n):
+        return 1 if n < LEAF_IDS else self.level[n - LEAF_IDS]
+
+    def population(self, n=None):
+        if n is None:
+            n = self.root
+        return LEAF_POP[n] if n < LEAF_IDS else self.pop[n - LEAF_IDS]
+
+    def join(self, a, b, c, d):
+        """The canonical node with children a (nw), b (ne), c (sw) and d (se)"""
+        h = node_hash(a, b, c, d)
+        mask = self.table_mask
+        table, nw, ne, sw, se = self.table, self.nw, self.ne, self.sw, self.se
+        i = h & mask
+        while True:
+            entry = table[i]
+            if not entry:
+                break
+            s = entry - 1 - LEAF_IDS
+            if nw[s] == a and ne[s] == b and sw[s] == c and se[s] == d:
+                return entry - 1
+            i = (i + 1) & mask
+
+        if not self.free_count:
+            raise OutOfNodes()
+        self.free_count -= 1
+        s = self.free[self.free_count]
+        nw[s], ne[s], sw[s], se[s] = a, b, c, d
+        self.level[s] = self.node_level(a) + 1
+        self.pop[s] = self.population(a) + self.population(b) + self.population(c) + self.population(d)
+        self.result[s] = NO_RESULT
+        table[i] = s + LEAF_IDS + 1
+        return s + LEAF_IDS
+
+    def empty_node(self, level):
+        empty = self.empty
+        while len(empty) <= level:
+            e = empty[-1]
+            empty.append(self.join(e, e, e, e))
+        return empty[level]
+
+    def centre(self, a, b, c, d):
+        """Centre of the square made of a, b, c and d, one level down from them"""
+        if a < LEAF_IDS:
+            # 2x2 nodes: the centre is a single level-1 node
+            return (a >> 3) | ((b >> 1) & 2) | ((c << 1) & 4) | ((d << 3) & 8)
+        o = LEAF_IDS
+        return self.join(self.se[a - o], self.sw[b - o], self.ne[c - o], self.nw[d - o])
+
+    def horizontal(self, a, b):
+        """The node straddling the shared edge of side by side a and b"""
+        o = LEAF_IDS
+        return self.join(self.ne[a - o], self.nw[b - o], self.se[a - o], self.sw[b - o])
+
+    def vertical(self, a, c):
+        """The node straddling the shared edge of a above c"""
+        o = LEAF_IDS
+        return self.join(self.sw[a - o], self.se[a - o], self.nw[c - o], self.ne[c - o])
+
+    def leaf_step(self, a, b, c, d):
+        """One generation of the centre 2x2 of a 4x4 square made of level-1 nodes"""
+        quads = (a, b, c, d)
+        grid = 0  # bit y * 4 + x
+        for y in range(4):
+            for x in range(4):
+                if (quads[(y >> 1) * 2 + (x >> 1)] >> ((y & 1) * 2 + (x & 1))) & 1:
+                    grid |= 1 << (y * 4 + x)
+
+        r = 0
+        for i in range(4):
+            x = 1 + (i & 1)
+            y = 1 + (i >> 1)
+            count = 0
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    if (dx or dy) and (grid >> ((y + dy) * 4 + x + dx)) & 1:
+                        count += 1
+            if count == 3 or (count == 2 and (grid >> (y * 4 + x)) & 1):
+                r |= 1 << i
+        return r
+
+    def successor(self, n):
+        """Centre half of node n advanced 2^min(level - 2, step_log) generations"""
+        s = n - LEAF_IDS
+        r = self.result[s]
+        if r != NO_RESULT:
+            return r
+
+        o = LEAF_IDS
+        a, b, c, d = self.nw[s], self.ne[s], self.sw[s], self.se[s]
+        level = self.level[s]
+        if level == 2:
+            r = self.leaf_step(a, b, c, d)
+        else:
+            # Nine overlapping squares one level down, each advanced
+            step = self.successor
+            r00 = step(a)
+            r01 = step(self.horizontal(a, b))
+            r02 = step(b)
+            r10 = step(self.vertical(a, c))
+            r11 = step(self.join(self.se[a - o], self.sw[b - o], self.ne[c - o], self.nw[d - o]))
+            r12 = step(self.vertical(b, d))
+            r20 = step(c)
+            r21 = step(self.horizontal(c, d))
+            r22 = step(d)
+
+            join = self.join
+            if self.step_log >= level - 2:
+                # Full speed: advance the four quarters again
+                r = join(
+                    step(join(r00, r01, r10, r11)),
+                    step(join(r01, r02, r11, r12)),
+                    step(join(r10, r11, r20, r21)),
+                    step(join(r11, r12, r21, r22)),
+                )
+            else:
+                # Already advanced far enough, just take the centres
+                centre = self.centre
+                r = join(
+                    centre(r00, r01, r10, r11),
+                    centre(r01, r02, r11, r12),
+                    centre(r10, r11, r20, r21),
+                    centre(r11, r12, r21, r22),
+                )
+
+        self.result[s] = r
+        return r
+
+    def set_step_log(self, step_log):
+        """Change how many generations (2^step_log) each step advances"""
+        step_log = max(0, min(MAX_STEP_LOG, step_log))
+        if step_log != self.step_log:
+            self.step_log = step_log
+            # Cached results were for the old step size
+            result = self.result
+            for i in range(self.max_nodes):
+                result[i] = NO_RESULT
+
+    def expand(self):
+        """Grow the root by one level, keeping it centred on the same spot"""
+        root = self.root
+        level = self.node_level(root)
+        o = LEAF_IDS
+        e = self.empty_node(level - 1)
+        a, b, c, d = self.nw[root - o], self.ne[root - o], self.sw[root - o], self.se[root - o]
+        self.root = self.join(
+            self.join(e, e, e, a),
+            self.join(e, e, b, e),
+            self.join(e, c, e, e),
+            self.join(d, e, e, e),
+        )
+        half = 1 << (level - 1)
+        self.root_x -= half
+        self.root_y -= half
+
+    def crop(self):
+        """Drop the outer half of the root, losing anything that far out"""
+        root = self.root
+        level = self.node_level(root)
+        o = LEAF_IDS
+        self.root = self.centre(self.nw[root - o], self.ne[root - o], self.sw[root - o], self.se[root - o])
+        quarter = 1 << (level - 2)
+        self.root_x += quarter
+        self.root_y += quarter
+
+    def centred(self):
+        """True if every live cell is within the centre half of the root"""
+        root = self.root - LEAF_IDS
+        o = LEAF_IDS
+        a, b, c, d = self.nw[root], self.ne[root], self.sw[root], self.se[root]
+        inner = (self.population(self.se[a - o]) + self.population(self.sw[b - o]) +
+                 self.population(self.ne[c - o]) + self.population(self.nw[d - o]))
+        return inner == self.pop[root]
+
+    def advance(self):
+        """Advance the root 2^step_log generations (raises OutOfNodes)"""
+        while self.node_level(self.root) < self.step_log + 3 or not self.centred():
+            if self.node_level(self.root) >= MAX_LEVEL:
+                self.crop()
+            self.expand()
+        # One more border so nothing can grow out of the result
+        self.expand()
+        self.root = self.successor(self.root)
+        quarter = 1 << (self.node_level(self.root) - 1)
+        self.root_x += quarter
+        self.root_y += quarter
+        self.generation += 1 << self.step_log
+
+    def step(self):
+        """Advance the universe, evicting cached nodes when the arrays fill up.
+
+        If a step still doesn't fit after eviction the step size is halved.
+        Returns False when even a single generation doesn't fit.
+        """
+        if self.free_count < self.max_nodes // 4:
+            self.collect(True)
+            if self.free_count < self.max_nodes // 2:
+                self.collect(False)
+
+        root, x, y = self.root, self.root_x, self.root_y
+        retried = False
+        while True:
+            try:
+                self.advance()
+                return True
+            except OutOfNodes:
+                self.root, self.root_x, self.root_y = root, x, y
+                self.collect(False)
+                if not retried:
+                    # Try once more with only the live universe cached
+                    retried = True
+                    continue
+                if not self.step_log:
+                    return False
+                self.set_step_log(self.step_log - 1)
+
+    def collect(self, keep_results):
+        """Evict every node the root can't reach (through its results too if keep_results)"""
+        o = LEAF_IDS
+        marks, result = self.marks, self.result
+        nw, ne, sw, se = self.nw, self.ne, self.sw, self.se
+        n = self.max_nodes
+        for i in range(n):
+            marks[i] = 0
+
+        stack = [self.root]
+        stack.extend(self.empty)
+        while stack:
+            node = stack.pop()
+            if node < o:
+                continue
+            s = node - o
+            if marks[s]:
+                continue
+            marks[s] = 1
+            stack.append(nw[s])
+            stack.append(ne[s])
+            stack.append(sw[s])
+            stack.append(se[s])
+            if keep_results and result[s] != NO_RESULT:
+                stack.append(result[s])
+
+        table = self.table
+        for i in range(len(table)):
+            table[i] = 0
+        mask = self.table_mask
+        level = self.level
+        self.free_count = 0
+        for s in range(n - 1, -1, -1):
+            if not marks[s]:
+                if level[s]:
+                    self.evictions += 1
+                level[s] = 0
+                self.free[self.free_count] = s
+                self.free_count += 1
+                continue
+            r = result[s]
+            if r != NO_RESULT and r >= o and not marks[r - o]:
+                result[s] = NO_RESULT
+            # Re-insert into the table
+            a, b, c, d = nw[s], ne[s], sw[s], se[s]
+            i = node_hash(a, b, c, d) & mask
+            while table[i]:
+                i = (i + 1) & mask
+            table[i] = s + o + 1
+
+    def set_cell(self, x, y):
+        """Make the cell at world position (x, y) alive"""
+        while True:
+            size = 1 << self.node_level(self.root)
+            if self.root_x <= x < self.root_x + size and self.root_y <= y < self.root_y + size:
+                break
+            self.expand()
+        self.root = self.set_in(self.root, x - self.root_x, y - self.root_y)
+
+    def set_in(self, n, x, y):
+        level = self.node_level(n)
+        if level == 1:
+            return n | (1 << (y * 2 + x))
+        s = n - LEAF_IDS
+        half = 1 << (level - 1)
+        a, b, c, d = self.nw[s], self.ne[s], self.sw[s], self.se[s]
+        if y < half:
+            if x < half:
+                a = self.set_in(a, x, y)
+            else:
+                b = self.set_in(b, x - half, y)
+        elif x < half:
+            c = self.set_in(c, x, y - half)
+        else:
+            d = self.set_in(d, x - half, y - half)
+        return self.join(a, b, c, d)
+
+    def blocks(self, left, top, width, height, block_log, visit):
+        """Call visit(x, y, population) for each live 2^block_log square in the rectangle"""
+        self.visit_blocks(self.root, self.root_x, self.root_y, left, top,
+                          left + width, top + height, block_log, visit)
+
+    def visit_blocks(self, n, x, y, left, top, right, bottom, block_log, visit):
+        level = self.node_level(n)
+        size = 1 << level
+        if x >= right or y >= bottom or x + size <= left or y + size <= top:
+            return
+        if n < LEAF_IDS:
+            if not n:
+                return
+            if block_log:
+                visit(x, y, LEAF_POP[n])
+                return
+            for i in range(4):
+                if (n >> i) & 1:
+                    visit(x + (i & 1), y + (i >> 1), 1)
+            return
+
+        s = n - LEAF_IDS
+        if not self.pop[s]:
+            return
+        if level <= block_log:
+            visit(x, y, self.pop[s])
+            return
+        half = size >> 1
+        self.visit_blocks(self.nw[s], x, y, left, top, right, bottom, block_log, visit)
+        self.visit_blocks(self.ne[s], x + half, y, left, top, right, bottom, block_log, visit)
+        self.visit_blocks(self.sw[s], x, y + half, left, top, right, bottom, block_log, visit)
+        self.visit_blocks(self.se[s], x + half, y + half, left, top, right, bottom, block_log, visit)
@@ -3,6 +3,7 @@ import os
 
 sys.path.insert(0, "/system/apps/menu")
 os.chdir("/system/apps/menu")
+sys.path.append("/system/lib")
 
 import math
 from badgeware import screen, PixelFont, Image, SpriteSheet, is_dir, file_exists, shapes, brushes, io, run
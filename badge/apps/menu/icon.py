@@ -1,4 +1,4 @@
-import math
+import trig
 from badgeware import brushes, shapes, io, Matrix, screen
 
 # bright icon colours
@@ -22,6 +22,9 @@ faded = [
     brushes.color(255 / fade, 128 / fade, 210 / fade),
 ]
 
+# the spin animation follows cos(frame / 100), one cycle every SPIN_PERIOD ms
+SPIN_PERIOD = trig.period(100)
+
 # icon shape
 squircle = shapes.squircle(0, 0, 20, 4)
 shade_brush = brushes.color(0, 0, 0, 30)
@@ -58,7 +61,7 @@ class Icon:
             frame = io.ticks - self.spin_start
 
             # calculate the width of the tile during this part of the animation
-            width = round(math.cos(frame / speed) * 3) / 3
+            width = round(trig.cos(trig.angle(frame, SPIN_PERIOD)) * 3) / 3
 
             # ensure the width never reduces to zero or the icon disappears
             width = max(0.1, width) if width > 0 else min(-0.1, width)
@@ -1,4 +1,4 @@
-import math
+import trig
 import random
 from badgeware import brushes, shapes, io, screen, Matrix, get_battery_level, is_charging
 
@@ -85,9 +85,12 @@ def draw_terminal():
     screen.draw(shapes.rectangle(0, 15, 160, 3))
 
 
+HEADER_PERIOD = trig.period(250)
+
+
 def draw_header():
     # create animated header text
-    dots = "." * int(math.sin(io.ticks / 250) * 2 + 2)
+    dots = "." * int(trig.wave(io.ticks, HEADER_PERIOD) * 2 + 2)
     label = f"Mona-OS v4.03{dots}"
     pos = (5, 2)
 
@@ -3,11 +3,15 @@ import os
 
 sys.path.insert(0, "/system/apps/monapet")
 os.chdir("/system/apps/monapet")
+sys.path.append("/system/lib")
 
 
+import time
 import ui
+import hibernate
+from store import Store
 from mona import Mona
-from badgeware import io, run, State
+from badgeware import io, run
 
 mona = Mona(82)  # create mona!
 
@@ -16,36 +20,91 @@ happiness_duration = 1800
 hunger_duration = 1200
 cleanliness_duration = 2400
 
+# press DOWN to put the badge to sleep. mona's stats carry on falling while
+# it's asleep and it wakes every SLEEP_INTERVAL to check on her. if she needs
+# attention she's shown for WAKE_TIME, press any button to stay awake
+SLEEP_INTERVAL = 5 * 60 * 1000
+WAKE_TIME = 3000
+woken_at = None
+
+# mona's stats are saved when something happens to her: a press, a stat
+# falling past a multiple of STAT_STEP, or her being reset. the save waits
+# for a quiet minute so a burst of those is one write, and happens straight
+# away when the app exits or the badge goes to sleep. saved_at is only
+# recorded then, the stats saved in between have no time to catch up from
+STAT_STEP = 10
+store = Store("monapet", {
+    "happy": 100,
+    "hunger": 100,
+    "clean": 100,
+    "saved_at": None,
+}, delay=60000, max_delay=120000)
+
+
+def decay(seconds):
+    # work out how much mona's stats have reduced over the given time. they
+    # fall in a straight line, so any length of time can be applied at once
+    mona.happy(-(seconds / happiness_duration) * 100)
+    mona.hunger(-(seconds / hunger_duration) * 100)
+    mona.clean(-(seconds / cleanliness_duration) * 100)
+
+
+def catch_up(seconds):
+    # apply time spent away from the app. mona stops changing once a stat
+    # reaches zero, so only the time until then counts
+    if seconds <= 0 or mona.is_dead():
+        return
+    until_dead = min(
+        mona.happy() * happiness_duration,
+        mona.hunger() * hunger_duration,
+        mona.clean() * cleanliness_duration,
+    ) / 100
+    decay(min(seconds, until_dead))
+
+
+def needs_attention():
+    return mona.is_dead() or min(mona.hunger(), mona.happy(), mona.clean()) < 30
+
+
+def record_stats(force=False):
+    # the stats fall a little every frame, so they're only queued for saving
+    # when one reaches a new step, or on a press with force
+    for key, value in mona.save().items():
+        if force or value // STAT_STEP != store[key] // STAT_STEP:
+            store[key] = value
+
+
+def go_to_sleep():
+    store_state()
+    store.flush()
+    hibernate.sleep("/system/apps/monapet", SLEEP_INTERVAL)
+
 
 def game_update():
     global mona
 
     if not mona.is_dead():
         # calculate mona's new stats based on the time since last update
-        seconds = io.ticks_delta / 1000
-
-        # work out how much mona's stats have reduce since the last frame
-        happy_delta = (seconds / happiness_duration) * 100
-        mona.happy(-happy_delta)
-        hunger_delta = (seconds / hunger_duration) * 100
-        mona.hunger(-hunger_delta)
-        clean_delta = (seconds / cleanliness_duration) * 100
-        mona.clean(-clean_delta)
+        decay(io.ticks_delta / 1000)
+        record_stats()
 
         # play with mona!
         if io.BUTTON_A in io.pressed:
             mona.happy(30)
             mona.do_action("heart")
+            record_stats(True)
 
         # feed mona!
         if io.BUTTON_B in io.pressed:
             mona.hunger(30)
             mona.do_action("eating")
+            record_stats(True)
 
         # clean mona!
         if io.BUTTON_C in io.pressed:
             mona.clean(30)
             mona.do_action("dance")
+            record_stats(True)
 
         # every five seconds mona will move to a new location
         if mona.time_since_last_position_change() > 5:
@@ -66,15 +125,35 @@ def game_update():
         # if user pressed button b then reset mona's stats
         if io.BUTTON_B in io.pressed:
             mona = Mona(82)
+            record_stats(True)
 
 
 def update():
+    global woken_at
+
+    # woken up to show mona needs attention, go back to sleep unless a button
+    # is pressed
+    if hibernate.woken:
+        if woken_at is None:
+            woken_at = io.ticks
+        if io.pressed:
+            hibernate.woken = None
+        elif io.ticks - woken_at > WAKE_TIME:
+            go_to_sleep()
+
     # update the game state based on user input and timed events
     game_update()
 
+    # put the badge to sleep
+    if io.BUTTON_DOWN in io.pressed:
+        go_to_sleep()
+
     # update monas state (position)
     mona.update()
 
+    # write any queued stats while mona isn't mid-action
+    store.update(idle=not mona.current_action())
+
     # draw the background scene
     ui.background(mona)
 
@@ -97,19 +176,33 @@ def update():
 
 
 def init():
-    state = {
-        "happy": 100,
-        "hunger": 100,
-        "clean": 100,
-    }
-    if State.load("monapet", state):
-        mona.load(state)
+    if store.load():
+        mona.load(store.data)
+
+        # catch up on the time since the stats were saved. the clock keeps
+        # running through sleep, but starts again if the battery runs out, in
+        # which case the time is unknown and skipped
+        if store["saved_at"] is not None:
+            catch_up(time.time() - store["saved_at"])
+
+        # the stats from here on are newer than saved_at, which isn't written
+        # again until the app exits or sleeps. drop it so a save in between
+        # can't be caught up twice after a crash
+        store.data["saved_at"] = None
+
+    # woken just to update the stats, straight back to sleep if all is well
+    if hibernate.woken and not needs_attention():
+        go_to_sleep()
+
 
-    del state
+def store_state():
+    record_stats(True)
+    store["saved_at"] = time.time()
 
 
 def on_exit():
-    State.save("monapet", mona.save())
+    store_state()
+    store.flush()
 
 
 if __name__ == "__main__":
@@ -6,7 +6,33 @@ os.chdir("/system/apps/monapet")
 
 from badgeware import screen, brushes, SpriteSheet, shapes, clamp, io
 import random
-import math
+import struct
+import gc
+import trig
+from variants import VariantCache
+
+# a dead mona bobs up and down like sin(io.ticks / 250)
+FLOAT_PERIOD = trig.period(250)
+
+# monas animations are loaded the first time they're needed and kept while
+# their decoded sprites fit in ANIMATION_BUDGET bytes. when a new one doesn't
+# fit, the least recently used ones are dropped to make room
+ANIMATION_BUDGET = 112 * 1024
+
+# mona's faded reflection is cached per frame so it's a plain blit. a frame's
+# reflection is its width * 2 by 20 pixels, so the largest animation (eating,
+# 12 frames 31 wide) takes 58KB facing one way and the budget holds it facing
+# both. mona herself is a single scale_blit, caching her at double size
+# wouldn't fit
+variants = VariantCache(120 * 1024)
+
+# bytes a png takes once decoded, read from its header
+def decoded_size(path):
+  with open(path, "rb") as f:
+    header = f.read(24)
+  width, height = struct.unpack(">II", header[16:24])
+  return width * height * 4
+
 
 # this class defines our little friend, modify it to change their behaviour!
 #
@@ -20,6 +46,8 @@ import math
 class Mona:
   _moods = []
   _animations = {}
+  _animation_sizes = {}
+  _recent = []  # loaded animation names, most recently used last
 
   def __init__(self, y):
     self._happy = 100
@@ -35,6 +63,7 @@ class Mona:
     self._direction = 1
     self._target = 80
     self._speed = 0.5
+    self._next_idle = None
     self.set_mood("default")
 
   def load(self, state):
@@ -55,10 +84,13 @@ class Mona:
 
     # select sprite for current animation frame
     if self._action:
+      name = self._action
       action_time = (io.ticks / 1000) - self._action_changed_at
-      image = Mona._animations[self._action].frame(round(action_time * 10))
+      index = round(action_time * 10) % animations[name]
     else:
-      image = Mona._animations[self._mood].frame(round(io.ticks / 100))
+      name = self._mood
+      index = round(io.ticks / 100) % animations[name]
+    image = Mona.animation(name).frame(index)
 
     width, height = image.width * 2, image.height * 2
 
@@ -71,7 +103,7 @@ class Mona:
     width *= self._direction
 
     # is mona floating?
-    floating = math.sin(io.ticks / 250) * 5 + 5 if self._mood == "dead" else 0
+    floating = trig.wave(io.ticks, FLOAT_PERIOD) * 5 + 5 if self._mood == "dead" else 0
 
     # offset sprite
     x -= abs(width / 2)
@@ -81,11 +113,11 @@ class Mona:
     alpha = 150 if self._mood == "dead" else 255
     image.alpha = alpha
     screen.scale_blit(image, x, y, width, height)
+    image.alpha = 255
 
     # draw monas reflection
-    image.alpha = int(alpha * 0.2)
-    screen.scale_blit(image, x, self._position[1] + (floating / 2) + 1, width, -20)
-    image.alpha = 255
+    reflection = variants.get((name, index), image, width, -20, int(alpha * 0.2))
+    screen.blit(reflection, x, self._position[1] + (floating / 2) + 1)
 
   # set a new target position for mona to move to
   def move_to(self, target):
@@ -152,10 +184,40 @@ class Mona:
       if (io.ticks / 1000) - self._action_changed_at > 2:
         self._action = None
 
-  # select a random mood for mona
+  # select a random mood for mona. the one after it is picked now too so its
+  # animation can be loaded ahead of time
   def random_idle(self):
     idles = ["code", "default", "heart", "dance"]
-    self.set_mood(random.choice(idles))
+    self.set_mood(self._next_idle or random.choice(idles))
+    self._next_idle = random.choice(idles)
+    Mona.animation(self._next_idle)
+
+  # return an animation, loading it if it isn't already
+  @classmethod
+  def animation(cls, name):
+    animation = cls._animations.get(name)
+    if animation is not None:
+      if cls._recent[-1] != name:
+        cls._recent.remove(name)
+        cls._recent.append(name)
+      return animation
+
+    # make room for it before loading, so the budget is never exceeded
+    path = f"/system/assets/mona-sprites/mona-{name}.png"
+    size = decoded_size(path)
+    used = sum(cls._animation_sizes.values())
+    if cls._recent and used + size > ANIMATION_BUDGET:
+      while cls._recent and used + size > ANIMATION_BUDGET:
+        oldest = cls._recent.pop(0)
+        del cls._animations[oldest]
+        used -= cls._animation_sizes.pop(oldest)
+      gc.collect()
+
+    animation = SpriteSheet(path, animations[name], 1).animation()
+    cls._animations[name] = animation
+    cls._animation_sizes[name] = size
+    cls._recent.append(name)
+    return animation
 
   # return the number of seconds since monas mood changed
   def time_since_last_mood_change(self):
@@ -177,11 +239,5 @@ animations = {
   "dead":     7, # oh no, mona!
 }
 
-# load the spritesheets for monas animations
-for name, frame_count in animations.items():
-  sprites = SpriteSheet(f"/system/assets/mona-sprites/mona-{name}.png", frame_count, 1)
-  Mona._animations[name] = sprites.animation()  # noqa: SLF001
-print("done")
-
-Mona._moods = list(Mona._animations.keys())  # noqa: SLF001
+Mona._moods = list(animations.keys())  # noqa: SLF001
 
@@ -1,5 +1,5 @@
-import math
-from badgeware import screen, brushes, SpriteSheet, shapes, PixelFont, io
+import trig
+from badgeware import Image, screen, brushes, SpriteSheet, shapes, PixelFont, io
 
 # load user interface sprites
 icons = SpriteSheet("assets/icons.png", 4, 1)
@@ -27,24 +27,101 @@ stats_icons = {
 outline_brush = brushes.color(20, 30, 40, 150)
 outline_brush_bold = brushes.color(20, 30, 40, 200)
 
+WALLPAPER_PERIOD = trig.period(1000)
+BOUNCE_PERIOD = trig.period(200)
+
+# the wallpaper is a checkerboard of squares that wobble in size. one 20x20
+# tile of the pattern is rendered for each (rounded) square size the wobble
+# passes through, and the wall is rebuilt from those tiles only when the size
+# changes. the wall is a period wider than the screen so it can scroll with
+# mona as a single blit
+WALLPAPER_TILE = 20
+wall_brush = brushes.color(30, 50, 70)
+wallpaper_brush = brushes.color(30, 40, 20)
+wallpaper_tiles = {}
+wall = None
+wall_size = None
+
+# the floorboards only change when mona moves, so they are cached too
+floor_brush = brushes.color(30, 40, 20)
+floorboard_brush = brushes.color(100, 200, 100, 25)
+floor = None
+floor_x = None
+
+# the picture on the wall has its own small image, so the heart animation
+# doesn't have to be loaded just for it
+portrait = None
+
+
+def wallpaper_tile(size):
+    tile = wallpaper_tiles.get(size)
+    if tile is None:
+        tile = Image(0, 0, WALLPAPER_TILE, WALLPAPER_TILE)
+        tile.brush = wall_brush
+        tile.draw(shapes.rectangle(0, 0, WALLPAPER_TILE, WALLPAPER_TILE))
+        tile.brush = wallpaper_brush
+        half = WALLPAPER_TILE // 2
+        tile.draw(shapes.rectangle(0, 0, *size))
+        tile.draw(shapes.rectangle(half, half, *size))
+        wallpaper_tiles[size] = tile
+    return tile
+
+
+def draw_wall(floor_y, mx):
+    global wall, wall_size
+
+    a = trig.angle(io.ticks, WALLPAPER_PERIOD)
+    size = (round(trig.sin(a) * 2) + 4, round(trig.cos(a) * 2) + 4)
+    if wall is None or wall.height != floor_y:
+        wall = Image(0, 0, 160 + WALLPAPER_TILE, floor_y)
+        wall_size = None
+    if size != wall_size:
+        tile = wallpaper_tile(size)
+        for y in range(-3, floor_y, WALLPAPER_TILE):
+            for x in range(0, wall.width, WALLPAPER_TILE):
+                wall.blit(tile, x, y)
+        wall_size = size
+
+    screen.blit(wall, -(int(mx) % WALLPAPER_TILE), 0)
+
+
+def draw_floor(floor_y, mona_x):
+    global floor, floor_x
+
+    mona_x = int(mona_x)
+    if floor is None or floor.height != 120 - floor_y:
+        floor = Image(0, 0, 160, 120 - floor_y)
+        floor_x = None
+    if mona_x != floor_x:
+        # draw background fill
+        floor.brush = floor_brush
+        floor.draw(shapes.rectangle(0, 0, 160, floor.height))
+
+        # draw angled "floorboard" lines centered on mona
+        floor.brush = floorboard_brush
+        for i in range(0, 300, 10):
+            x1 = i - ((mona_x - i) * 1.5)
+            x2 = i - ((mona_x - i) * 2)
+            floor.draw(shapes.line(x1, 5, x2, 19, 2))
+        floor_x = mona_x
+
+    screen.blit(floor, 0, floor_y)
+
+
+def get_portrait():
+    global portrait
+    if portrait is None:
+        portrait = Image.load("assets/portrait.png")
+    return portrait
+
+
 # draw the background scenery
 def background(mona):
     floor_y, mona_x = mona.position()[1] - 5, mona.position()[0]
 
-    # fill the wall background
-    screen.brush = brushes.color(30, 50, 70)
-    screen.draw(shapes.rectangle(0, 0, 160, floor_y))
-
-    # animate the wallpaper
-    screen.brush = brushes.color(30, 40, 20)
+    # draw the wall and its animated wallpaper
     mx = (mona_x - 80) / 2
-    for y in range(8):
-        for x in range(19):
-            if (x + y) % 2 == 0:
-                xo = math.sin(io.ticks / 1000) * 2
-                yo = math.cos(io.ticks / 1000) * 2
-                screen.draw(shapes.rectangle(
-                    x * 10 - mx, y * 10 - 3, xo + 4, yo + 4))
+    draw_wall(floor_y, mx)
 
     # draw the picture frame
     px = 140 - mx
@@ -57,8 +134,7 @@ def background(mona):
     screen.draw(shapes.rectangle(px, 20, 38, 28))
     screen.brush = brushes.color(120, 130, 140, 255)
     screen.draw(shapes.rectangle(px + 2, 20 + 2, 38 - 4, 28 - 4))
-    portrait = mona._animations["heart"].frame(7)  # noqa: SLF001
-    screen.blit(portrait, px + 8, 20)
+    screen.blit(get_portrait(), px + 8, 20)
 
     # draw the skirting board
     screen.brush = brushes.color(80, 90, 100, 150)
@@ -69,19 +145,7 @@ def background(mona):
     screen.blit(icons.sprite(3, 0), px - 20, floor_y - 18)
 
     # draw the floor
-    floor = screen.window(0, floor_y, 160, 120)  # clip drawing to floor area
-
-    # draw background fill
-    floor.brush = brushes.color(30, 40, 20)
-    floor.draw(shapes.rectangle(0, 0, 160, 120 - floor_y))
-
-    # draw angled "floorboard" lines centered on mona
-    floor.brush = brushes.color(100, 200, 100, 25)
-    for i in range(0, 300, 10):
-        x1 = i - ((mona_x - i) * 1.5)
-        x2 = i - ((mona_x - i) * 2)
-        line = shapes.line(x1, 5, x2, 19, 2)
-        floor.draw(line)
+    draw_floor(floor_y, mona_x)
 
 # draw the title banner
 
@@ -100,7 +164,7 @@ def draw_button(x, y, label, active):
     width = 50
 
     # create an animated bounce effect
-    bounce = math.sin(((io.ticks / 20) - x) / 10) * 2
+    bounce = trig.wave(io.ticks, BOUNCE_PERIOD, -trig.radians(x / 10)) * 2
 
     # draw the button label
     screen.brush = brushes.color(255, 255, 255, 255 if active else 150)
@@ -3,10 +3,12 @@ import os
 
 sys.path.insert(0, "/system/apps/quest")
 os.chdir("/system/apps/quest")
+sys.path.append("/system/lib")
 
 import math
 import random
-from badgeware import State, PixelFont, Image, brushes, screen, io, shapes, run
+from badgeware import PixelFont, Image, brushes, screen, io, shapes, run
+from store import Store
 from beacon import GithubUniverseBeacon
 from aye_arr.nec import NECReceiver
 import ui
@@ -40,22 +42,23 @@ for quest in quests:
   GithubUniverseBeacon.BUTTON_CODES[quest.id] = quest.code
 
 
-state = {
+# found locations are saved in the background, a moment after they're found
+store = Store("quest", {
   "completed": []
-}
+})
 
 # load state here
-State.load("quest", state)
+store.load()
 
 _last_task_completed = None
 _last_task_completed_at = None
 def complete_quest(id):
   global _last_task_completed_at, _last_task_completed
-  if id not in state["completed"] and id <= len(quests):
+  if id not in store["completed"] and id <= len(quests):
     _last_task_completed_at = io.ticks
     _last_task_completed = quests[id - 1]
-    state["completed"].append(id)
-    State.save("quest", state)
+    store["completed"].append(id)
+    store.changed("completed")
 
 # setup the ir receiver to callback to our complete quest method when a code
 # is received...
@@ -71,13 +74,16 @@ def update():
   # decode any ir events that have occurred
   receiver.decode()
 
+  # save newly found locations once things are quiet
+  store.update()
+
   # clear the screen
   screen.brush = brushes.color(35, 41, 37)
   screen.draw(shapes.rectangle(0, 0, 160, 120))
 
   # draw the quest tile grid
-  ui.draw_status(state["completed"])
-  ui.draw_tiles(state["completed"])
+  ui.draw_status(store["completed"])
+  ui.draw_tiles(store["completed"])
 
   # if button pressed and we're showing a quest completed screen then dismiss it
   if io.pressed and _last_task_completed_at:
@@ -101,7 +107,7 @@ def update():
 
       label = _last_task_completed.name
       message = "Location Unlocked!"
-      if len(state["completed"]) == len(quests):
+      if len(store["completed"]) == len(quests):
         message = "Side Quest Complete!"
 
       screen.font = large_font
@@ -124,5 +130,9 @@ def update():
       screen.text(message, 80 - (mw / 2), 19)
 
 
+def on_exit():
+  store.flush()
+
+
 if __name__ == "__main__":
-    run(update)
+    run(update, on_exit=on_exit)
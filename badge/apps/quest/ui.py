@@ -1,4 +1,4 @@
-import math
+import trig
 from badgeware import *
 
 screen.antialias = Image.X2
@@ -33,41 +33,73 @@ def draw_status(complete):
   screen.text("found", 7, 30)
 
 
-def draw_tiles(complete):
-  # define tile shape and set position of tile grid
+# inactive tile borders throb like sin(io.ticks / 250), offset by a radian
+# per diagonal so the pulse ripples across the grid
+TILE_PULSE = trig.period(250)
+TILE_PHASE = [trig.radians(d) for d in range(5)]
+
+# tiles are rendered once for each of a few brightness levels of the pulse
+# and kept in an atlas, so the grid is nine blits. PULSE_LEVEL maps a trig
+# table angle to its level
+TILE_SIZE = 32
+PULSE_LEVELS = 6
+PULSE_LEVEL = bytes([min(int(p * PULSE_LEVELS), PULSE_LEVELS - 1) for p in trig.PULSE])
+tile_atlas = {}  # tile index -> (complete, [image for each pulse level])
+
+
+def render_tile(index, complete, pulse):
+  image = Image(0, 0, TILE_SIZE, TILE_SIZE)
+  image.antialias = Image.X2
+  image.font = large_font
   tile = shapes.squircle(0, 0, 1, 6)
+  centre = TILE_SIZE / 2
+
+  if complete:
+    image.brush = tile_colors[index]
+    tile.transform = Matrix().translate(centre, centre).scale(16)
+    image.draw(tile)
+    image.brush = brushes.color(255, 255, 255, 150 * pulse)
+  else:
+    border_brush = brushes.color(50 * pulse, 60 * pulse, 70 * pulse)
+    tile.transform = Matrix().translate(centre, centre).scale(16)
+    image.brush = border_brush
+    image.draw(tile)
+    image.brush = brushes.color(21, 27, 35)
+    tile.transform = Matrix().translate(centre, centre).scale(14)
+    image.draw(tile)
+    image.brush = border_brush
+
+  # tile label
+  image.text(str(index), centre - 6, centre - 15)
+  return image
+
+
+def tile_image(index, complete, level):
+  # tiles only ever change from incomplete to complete, the old images are
+  # dropped when they do
+  entry = tile_atlas.get(index)
+  if entry is None or entry[0] != complete:
+    entry = (complete, [None] * PULSE_LEVELS)
+    tile_atlas[index] = entry
+
+  image = entry[1][level]
+  if image is None:
+    pulse = 0.8 + (((level + 0.5) / PULSE_LEVELS) / 2)
+    image = render_tile(index, complete, pulse)
+    entry[1][level] = image
+  return image
+
+
+def draw_tiles(complete):
+  # set position of tile grid (the centre of the first tile)
   pos = (70, 31)
-  screen.font = large_font
+  angle = trig.angle(io.ticks, TILE_PULSE)
 
   for y in range(0, 3):
     for x in range(0, 3):
       # animate the inactive tile borders
-      pulse = (math.sin(io.ticks / 250 + (x + y)) / 2) + 0.5
-      pulse = 0.8 + (pulse / 2)
+      level = PULSE_LEVEL[(angle + TILE_PHASE[x + y]) & trig.MASK]
 
-      # tile label
       index = x + (y * 3) + 1
-      label = str(index)
-
-      # determine centre point of tile
-      xo, yo = x * 34, y * 34
-
-      # calculate label position in tile
-      label_pos = (xo + pos[0] - 6, yo + pos[1] - 15)
-
-      if index in complete:
-        screen.brush = tile_colors[index]
-        tile.transform = Matrix().translate(*pos).translate(xo, yo).scale(16)
-        screen.draw(tile)
-        screen.brush = brushes.color(255, 255, 255, 150 * pulse)
-        screen.text(label, *label_pos)
-      else:
-        border_brush = brushes.color(50 * pulse, 60 * pulse, 70 * pulse)
-        tile.transform = Matrix().translate(*pos).translate(xo, yo).scale(16)
-        screen.brush = border_brush
-        screen.draw(tile)
-        screen.brush = brushes.color(21, 27, 35)
-        tile.transform = Matrix().translate(*pos).translate(xo, yo).scale(14)
-        screen.draw(tile)
-        screen.brush = border_brush
-        screen.text(label, *label_pos)
+      image = tile_image(index, index in complete, level)
+      screen.blit(image, pos[0] + x * 34 - TILE_SIZE // 2, pos[1] + y * 34 - TILE_SIZE // 2)
@@ -3,12 +3,18 @@ import os
 
 sys.path.insert(0, "/system/apps/sketch")
 os.chdir("/system/apps/sketch")
+sys.path.append("/system/lib")
 
 from badgeware import Image, brushes, shapes, screen, io, run
 import ui
+from ink import Ink
+from history import History
 
 
 canvas = Image(0, 0, ui.canvas_area[2], ui.canvas_area[3])
+ink = Ink(ui.canvas_area[2], ui.canvas_area[3])
+ink_brush = brushes.color(105, 105, 105)
+history = History(ink, ink_brush, ui.paper_at)
 cursor = (ui.canvas_area[2] / 2, ui.canvas_area[3] / 2)
 mona_position = (10, 76)
 mona_target = (10, 76)
@@ -17,9 +23,24 @@ mona_direction = 1
 last_cursor_move = None
 last_cursor = None
 
+# the canvas is saved to flash as it changes. saves are coalesced (at most one
+# every AUTOSAVE_INTERVAL, which bounds flash wear) and only happen once the
+# cursor has rested for AUTOSAVE_IDLE so the write never interrupts drawing
+SAVE_FILE = "/sketch.bin"
+AUTOSAVE_INTERVAL = 30000
+AUTOSAVE_IDLE = 2000
+last_save = 0
+last_ink = 0
+
+# tap B to undo, hold it to redo (repeating while it's held)
+REDO_HOLD = 500
+REDO_REPEAT = 250
+b_down_at = None
+last_redo = None
+
 
 def update_cursor():
-    global cursor, last_cursor_move, last_cursor
+    global cursor, last_cursor_move, last_cursor, last_ink
     global left_dial_angle, right_dial_angle
 
     # update the cursor position based on user input and shift the dial animation
@@ -47,10 +68,38 @@ def update_cursor():
 
     if not last_cursor or int(last_cursor[0]) != int(cursor[0]) or int(last_cursor[1]) != int(cursor[1]):
         # draw to the canvas at the cursor position
-        canvas.brush = brushes.color(105, 105, 105)
-        canvas.draw(shapes.rectangle(int(cursor[0]), int(cursor[1]), 1, 1))
+        x, y = int(cursor[0]), int(cursor[1])
+        if not ink.inked(x, y):
+            history.record(ink.tile_at(x, y))
+        if ink.set(x, y):
+            canvas.brush = ink_brush
+            canvas.draw(shapes.rectangle(x, y, 1, 1))
+            last_ink = io.ticks
     last_cursor = cursor
 
+
+def update_history():
+    global b_down_at, last_redo, last_ink
+
+    if io.BUTTON_B in io.pressed:
+        b_down_at = io.ticks
+        last_redo = None
+
+    if b_down_at is None:
+        return
+
+    if io.BUTTON_B in io.held:
+        if io.ticks - b_down_at >= REDO_HOLD and (last_redo is None or io.ticks - last_redo >= REDO_REPEAT):
+            if history.redo(canvas):
+                last_ink = io.ticks
+            last_redo = io.ticks
+    else:
+        # released before it became a hold
+        if last_redo is None and history.undo(canvas):
+            last_ink = io.ticks
+        b_down_at = None
+
+
 # animate mona to her target location
 
 
@@ -67,11 +116,20 @@ def update_mona():
             ui.canvas_area[2] / 2) else -1
 
 
+def autosave():
+    global last_save
+    if ink.dirty_count and io.ticks - last_save > AUTOSAVE_INTERVAL and io.ticks - last_ink > AUTOSAVE_IDLE:
+        ink.save(SAVE_FILE)
+        last_save = io.ticks
+
+
 def update():
     global mona_target, mona_direction
 
     update_cursor()
+    update_history()
     update_mona()
+    autosave()
 
     ui.draw_background()
 
@@ -90,6 +148,17 @@ def update():
     ui.draw_dial(right_dial_angle, (155, 115))
 
 
+def init():
+    # restore the last saved sketch
+    if ink.load(SAVE_FILE):
+        canvas.brush = ink_brush
+        ink.draw(canvas)
+
+
+def on_exit():
+    ink.save(SAVE_FILE)
+
+
 if __name__ == "__main__":
-    run(update)
+    run(update, init=init, on_exit=on_exit)
 
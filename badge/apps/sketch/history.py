@@ -0,0 +1,92 @@
+from badgeware import shapes
+from ink import TILE
+
+# each entry is a tile index (two bytes) and the tile's 8 bytes of ink
+ENTRY_SIZE = 2 + TILE
+
+
+class History:
+    # undo history as a ring of tile deltas with a fixed byte budget.
+    #
+    # the first time the cursor inks a tile after moving into it, the tile's
+    # bytes from before are recorded. undoing swaps an entry's bytes with the
+    # tile's current ones, so the entry then holds what redo needs to put
+    # back, and redoing swaps them again. when the ring is full the oldest
+    # entry is forgotten. paper_at(x, y) gives the brush that rubs out the
+    # ink at a canvas pixel
+    def __init__(self, ink, ink_brush, paper_at, budget=2048):
+        self.ink = ink
+        self.ink_brush = ink_brush
+        self.paper_at = paper_at
+        self.capacity = budget // ENTRY_SIZE
+        self.entries = bytearray(self.capacity * ENTRY_SIZE)
+        self.start = 0  # ring slot of the oldest entry
+        self.count = 0  # entries recorded
+        self.position = 0  # entries applied, the ones after this can be redone
+        self.open_tile = None  # tile being drawn in, already recorded
+
+    def slot(self, index):
+        return ((self.start + index) % self.capacity) * ENTRY_SIZE
+
+    def record(self, tile):
+        # call before inking a pixel of tile
+        if tile == self.open_tile:
+            return
+        self.open_tile = tile
+
+        # new drawing means nothing can be redone any more
+        self.count = self.position
+        if self.count == self.capacity:
+            self.start = (self.start + 1) % self.capacity
+            self.count -= 1
+
+        slot = self.slot(self.count)
+        entries, bits = self.entries, self.ink.bits
+        entries[slot] = tile & 0xFF
+        entries[slot + 1] = tile >> 8
+        for row in range(TILE):
+            entries[slot + 2 + row] = bits[tile * TILE + row]
+        self.count += 1
+        self.position = self.count
+
+    def undo(self, canvas):
+        if not self.position:
+            return False
+        self.position -= 1
+        self.swap(self.position, canvas)
+        return True
+
+    def redo(self, canvas):
+        if self.position == self.count:
+            return False
+        self.swap(self.position, canvas)
+        self.position += 1
+        return True
+
+    def swap(self, index, canvas):
+        # exchange the entry's bytes with the tile's and redraw just the
+        # pixels that changed: at most one small rectangle per pixel of a tile
+        slot = self.slot(index)
+        entries, ink = self.entries, self.ink
+        tile = entries[slot] | (entries[slot + 1] << 8)
+        left = (tile % ink.tiles_x) * TILE
+        top = (tile // ink.tiles_x) * TILE
+        for row in range(TILE):
+            i = tile * TILE + row
+            old = ink.bits[i]
+            new = entries[slot + 2 + row]
+            ink.bits[i] = new
+            entries[slot + 2 + row] = old
+
+            changed = old ^ new
+            x = left
+            while changed:
+                if changed & 1:
+                    canvas.brush = self.ink_brush if new & 1 else self.paper_at(x, top + row)
+                    canvas.draw(shapes.rectangle(x, top + row, 1, 1))
+                changed >>= 1
+                new >>= 1
+                x += 1
+
+        ink.mark(tile)
+        self.open_tile = None
@@ -0,0 +1,123 @@
+from badgeware import shapes
+
+# the canvas only ever has grey ink drawn on it, so one bit per pixel is
+# enough to rebuild it. the bits are kept in 8x8 tiles: tile t is the 8 bytes
+# from t * 8, one per row, with bit x set for each inked pixel
+TILE = 8
+
+# the save file is a short header followed by the tile bytes exactly as they
+# are in memory, so changed tiles can be rewritten in place
+MAGIC = b"SKT1"
+HEADER_SIZE = 8  # magic, tiles across, tiles down and two spare bytes
+
+
+class Ink:
+    def __init__(self, width, height):
+        self.tiles_x = (width + TILE - 1) // TILE
+        self.tiles_y = (height + TILE - 1) // TILE
+        self.tile_count = self.tiles_x * self.tiles_y
+        self.bits = bytearray(self.tile_count * TILE)
+
+        # tiles changed since the last save
+        self.dirty = bytearray(self.tile_count)
+        self.dirty_count = 0
+
+    def tile_at(self, x, y):
+        return (y // TILE) * self.tiles_x + x // TILE
+
+    def inked(self, x, y):
+        return self.bits[self.tile_at(x, y) * TILE + y % TILE] & (1 << (x % TILE))
+
+    def set(self, x, y):
+        # ink the pixel, returns false if it was already inked
+        tile = self.tile_at(x, y)
+        i = tile * TILE + y % TILE
+        bit = 1 << (x % TILE)
+        if self.bits[i] & bit:
+            return False
+        self.bits[i] |= bit
+        self.mark(tile)
+        return True
+
+    def mark(self, tile):
+        if not self.dirty[tile]:
+            self.dirty[tile] = 1
+            self.dirty_count += 1
+
+    def draw_tile(self, canvas, tile):
+        # draw the inked pixels of a tile onto the canvas, one rectangle per
+        # horizontal run of pixels
+        left = (tile % self.tiles_x) * TILE
+        top = (tile // self.tiles_x) * TILE
+        for row in range(TILE):
+            bits = self.bits[tile * TILE + row]
+            x = 0
+            while bits:
+                if bits & 1:
+                    start = x
+                    while bits & 1:
+                        bits >>= 1
+                        x += 1
+                    canvas.draw(shapes.rectangle(left + start, top + row, x - start, 1))
+                else:
+                    bits >>= 1
+                    x += 1
+
+    def draw(self, canvas):
+        # draw every inked pixel onto the canvas (canvas.brush must be set)
+        for tile in range(self.tile_count):
+            self.draw_tile(canvas, tile)
+
+    def header(self):
+        return MAGIC + bytes((self.tiles_x, self.tiles_y, 0, 0))
+
+    def load(self, path):
+        # read a saved canvas, returns false if there isn't a usable one
+        try:
+            with open(path, "rb") as f:
+                if f.read(HEADER_SIZE) != self.header():
+                    return False
+                f.readinto(self.bits)
+        except OSError:
+            return False
+
+        for tile in range(self.tile_count):
+            self.dirty[tile] = 0
+        self.dirty_count = 0
+        return True
+
+    def save(self, path):
+        # write the tiles changed since the last save. runs of neighbouring
+        # dirty tiles go out in a single write, and the whole file is only
+        # rewritten if it's missing or doesn't match
+        if not self.dirty_count:
+            return
+        try:
+            f = open(path, "r+b")
+            if f.read(HEADER_SIZE) != self.header():
+                f.close()
+                f = None
+        except OSError:
+            f = None
+
+        if f is None:
+            with open(path, "wb") as f:
+                f.write(self.header())
+                f.write(self.bits)
+        else:
+            with f:
+                bits = memoryview(self.bits)
+                tile = 0
+                while tile < self.tile_count:
+                    if not self.dirty[tile]:
+                        tile += 1
+                        continue
+                    start = tile
+                    while tile < self.tile_count and self.dirty[tile]:
+                        tile += 1
+                    f.seek(HEADER_SIZE + start * TILE)
+                    f.write(bits[start * TILE:tile * TILE])
+
+        for tile in range(self.tile_count):
+            self.dirty[tile] = 0
+        self.dirty_count = 0
@@ -1,16 +1,26 @@
-import math
+import trig
+from variants import VariantCache
 from badgeware import screen, PixelFont, SpriteSheet, shapes, brushes, io, Image
 
 screen.antialias = Image.X2
 canvas_area = (10, 15, 140, 85)
 
+# the canvas background and its shadows, also used to rub out ink
+paper_brush = brushes.color(210, 210, 210)
+paper_shadow_brush = brushes.color(180, 180, 180)
+
+# how fast the cursor throbs
+CURSOR_BLINK = trig.period(250)
+
 font = PixelFont.load("/system/assets/fonts/vest.ppf")
 mona = SpriteSheet("/system/assets/mona-sprites/mona-dance.png", 6, 1).animation()
+mona_variants = VariantCache(40 * 1024)  # both ways round, every frame
 
 
 def draw_mona(pos, direction):
-    frame = int(io.ticks / 150)
-    screen.scale_blit(mona.frame(frame), pos[0], pos[1], 28 * direction, 24)
+    frame = int(io.ticks / 150) % 6
+    image = mona_variants.get(frame, mona.frame(frame), 28 * direction, 24)
+    screen.blit(image, pos[0], pos[1])
 
 
 def draw_background():
@@ -27,9 +37,9 @@ def draw_background():
     screen.text("MonaSketch", 80 - (w / 2), 0)
 
     # draw the canvas area grey background and screen shadows
-    screen.brush = brushes.color(210, 210, 210)
+    screen.brush = paper_brush
     screen.draw(shapes.rounded_rectangle(*canvas_area, 6))
-    screen.brush = brushes.color(180, 180, 180)
+    screen.brush = paper_shadow_brush
     screen.draw(
         shapes.rounded_rectangle(
             canvas_area[0] + 3, canvas_area[1], canvas_area[2] - 5, 3, 2
@@ -59,6 +69,15 @@ def draw_background():
     )
 
 
+def paper_at(x, y):
+    # the brush of the canvas background under canvas pixel x, y (inside the
+    # shadows drawn along the top and left edges by draw_background)
+    width, height = canvas_area[2], canvas_area[3]
+    if (y < 3 and 3 <= x < width - 2) or (x < 3 and 3 <= y < height - 2):
+        return paper_shadow_brush
+    return paper_brush
+
+
 left_dial_angle = 0
 right_dial_angle = 0
 
@@ -84,16 +103,14 @@ def draw_dial(angle, pos):
     # draw the animated ticks around the dial edge
     screen.brush = brushes.color(190, 190, 220)
     ticks = 20
+    base = trig.degrees(angle)
     for i in range(ticks):
-        deg = angle + (i * 360 / ticks)
-        r = deg * (math.pi / 180.0)
+        a = base + (i * trig.STEPS // ticks)
+        s, c = trig.sin(a), trig.cos(a)
 
         # tick inner and outer points
-        outer = (pos[0] + math.sin(r) * radius, pos[1] + math.cos(r) * radius)
-        inner = (
-            pos[0] + math.sin(r) * (radius - 3),
-            pos[1] + math.cos(r) * (radius - 3),
-        )
+        outer = (pos[0] + s * radius, pos[1] + c * radius)
+        inner = (pos[0] + s * (radius - 3), pos[1] + c * (radius - 3))
 
         screen.draw(shapes.line(*inner, *outer, 1.5))
 
@@ -102,7 +119,7 @@ def draw_cursor(cursor):
     cx = int(cursor[0] + canvas_area[0])
     cy = int(cursor[1] + canvas_area[1])
     # draw the current cursor
-    i = (math.sin(io.ticks / 250) * 127) + 127
+    i = trig.pulse(io.ticks, CURSOR_BLINK) * 254
     screen.brush = brushes.xor(i, i, i)
     screen.draw(shapes.rectangle(cx + 2, cy, 2, 1))
     screen.draw(shapes.rectangle(cx - 3, cy, 2, 1))
@@ -1,8 +1,16 @@
 import sys
 import os
 
+sys.path.insert(0, "/system/apps/snake")
+os.chdir("/system/apps/snake")
+sys.path.append("/system/lib")
+
 from badgeware import screen, PixelFont, shapes, brushes, io, run
+from array import array
 import random
+from autopilot import AutoPilot
+from cellgrid import CellGrid
+from fixedstep import FixedStep
 
 # GitHub contribution graph colors (dark mode)
 COMMIT_COLORS = [
@@ -19,6 +27,13 @@ GRID_SIZE = 4  # Size of each square (includes 1px gap)
 SQUARE_SIZE = 3  # Actual drawn size (GRID_SIZE - 1 for gap)
 GRID_WIDTH = 40  # 160 / 4
 GRID_HEIGHT = 30  # 120 / 4
+CELLS = GRID_WIDTH * GRID_HEIGHT  # cells are numbered y * GRID_WIDTH + x
+
+# Palette indices of the cell grid
+EMPTY = 0
+SNAKE = 1
+COMMIT = 2  # first of the commit colours
+grid = CellGrid(GRID_WIDTH, GRID_HEIGHT, [BACKGROUND_COLOR, SNAKE_COLOR] + COMMIT_COLORS, GRID_SIZE, GRID_SIZE - SQUARE_SIZE)
 
 # Load font
 small_font = PixelFont.load("/system/assets/fonts/nope.ppf")
@@ -28,19 +43,101 @@ class GameState:
     PLAYING = 2
     GAME_OVER = 3
 
+class Board:
+    """Occupancy bitmap of the grid plus the set of free cells.
+    
+    The free cells are kept in a packed array with a reverse position lookup so
+    they can be added, removed and sampled uniformly in constant time.
+    """
+    def __init__(self):
+        self.bits = bytearray(CELLS // 8)
+        self.free = array("H", range(CELLS))
+        self.free_pos = array("H", range(CELLS))
+        self.free_count = CELLS
+    
+    def clear(self):
+        for i in range(len(self.bits)):
+            self.bits[i] = 0
+        for cell in range(CELLS):
+            self.free[cell] = cell
+            self.free_pos[cell] = cell
+        self.free_count = CELLS
+    
+    def occupied(self, cell):
+        return self.bits[cell >> 3] & (1 << (cell & 7))
+    
+    def occupy(self, cell):
+        self.bits[cell >> 3] |= 1 << (cell & 7)
+        # Swap the last free cell into this one's slot
+        pos = self.free_pos[cell]
+        self.free_count -= 1
+        last = self.free[self.free_count]
+        self.free[pos] = last
+        self.free_pos[last] = pos
+    
+    def release(self, cell):
+        self.bits[cell >> 3] &= ~(1 << (cell & 7))
+        self.free[self.free_count] = cell
+        self.free_pos[cell] = self.free_count
+        self.free_count += 1
+    
+    def random_free(self):
+        """Return a uniformly random free cell, or None if the board is full"""
+        if not self.free_count:
+            return None
+        return self.free[random.randrange(self.free_count)]
+
 class Snake:
     def __init__(self):
+        # Ring buffer of body cells from tail to head, and each cell's slot in it
+        self.body = array("H", bytearray(CELLS * 2))
+        self.where = array("H", bytearray(CELLS * 2))
+        self.board = Board()
         self.reset()
     
     def reset(self):
+        self.board.clear()
+        grid.fill(EMPTY)
+        self.tail = 0
+        self.length = 0
+        
         # Start in the middle
         start_x = GRID_WIDTH // 2
         start_y = GRID_HEIGHT // 2
-        self.segments = [(start_x, start_y), (start_x - 1, start_y), (start_x - 2, start_y)]
+        for x in (start_x - 2, start_x - 1, start_x):
+            self.push_head(start_y * GRID_WIDTH + x)
         self.direction = (1, 0)  # Moving right
         self.next_direction = (1, 0)
         self.grow_pending = 0
     
+    def push_head(self, cell):
+        slot = (self.tail + self.length) % CELLS
+        self.body[slot] = cell
+        self.where[cell] = slot
+        self.length += 1
+        self.board.occupy(cell)
+        grid.set(cell, SNAKE)
+    
+    def pop_tail(self):
+        cell = self.body[self.tail]
+        self.board.release(cell)
+        grid.set(cell, EMPTY)
+        self.tail = (self.tail + 1) % CELLS
+        self.length -= 1
+    
+    def head_cell(self):
+        return self.body[(self.tail + self.length - 1) % CELLS]
+    
+    def head(self):
+        cell = self.head_cell()
+        return (cell % GRID_WIDTH, cell // GRID_WIDTH)
+    
+    def cells(self):
+        """Iterate the body cells from tail to head"""
+        body, tail = self.body, self.tail
+        for i in range(self.length):
+            yield body[(tail + i) % CELLS]
+    
     def set_direction(self, dx, dy):
         # Prevent reversing direction
         current_dx, current_dy = self.direction
@@ -51,56 +148,55 @@ class Snake:
         self.direction = self.next_direction
         
         # Calculate new head position
-        head_x, head_y = self.segments[0]
+        head_x, head_y = self.head()
         dx, dy = self.direction
-        new_head = ((head_x + dx) % GRID_WIDTH, (head_y + dy) % GRID_HEIGHT)
+        new_head = ((head_y + dy) % GRID_HEIGHT) * GRID_WIDTH + (head_x + dx) % GRID_WIDTH
         
         # Check self collision
-        if new_head in self.segments:
+        if self.board.occupied(new_head):
             return False
         
         # Add new head
-        self.segments.insert(0, new_head)
+        self.push_head(new_head)
         
         # Remove tail unless growing
         if self.grow_pending > 0:
             self.grow_pending -= 1
         else:
-            self.segments.pop()
+            self.pop_tail()
         
         return True
     
     def grow(self):
         self.grow_pending += 1
-    
-    def draw(self):
-        screen.brush = brushes.color(*SNAKE_COLOR)
-        for x, y in self.segments:
-            screen.draw(shapes.rectangle(x * GRID_SIZE, y * GRID_SIZE, SQUARE_SIZE, SQUARE_SIZE))
 
 class Commit:
     def __init__(self):
         self.respawn()
     
-    def respawn(self):
-        self.x = random.randint(0, GRID_WIDTH - 1)
-        self.y = random.randint(0, GRID_HEIGHT - 1)
-        self.color = random.choice(COMMIT_COLORS)
-    
-    def draw(self):
-        screen.brush = brushes.color(*self.color)
-        screen.draw(shapes.rectangle(self.x * GRID_SIZE, self.y * GRID_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+    def respawn(self, board=None):
+        """Move to a random cell, picked from the board's free cells when given"""
+        cell = board.random_free() if board else None
+        if cell is None:
+            cell = random.randrange(CELLS)
+        self.x = cell % GRID_WIDTH
+        self.y = cell // GRID_WIDTH
+        shade = random.randrange(len(COMMIT_COLORS))
+        self.color = COMMIT_COLORS[shade]
+        grid.set(cell, COMMIT + shade)
 
 # Game state
 state = GameState.INTRO
 snake = Snake()
 commit = Commit()
 score = 0
-last_update = 0
-update_interval = 150  # milliseconds
+clock = FixedStep(1000 / 150, max_steps=2)  # one move every 150 milliseconds
+auto_play = False
+autopilot = AutoPilot(snake, GRID_WIDTH, GRID_HEIGHT)
+autopilot_budget = 8  # milliseconds of path search per frame
 
 def update():
-    global state, score, last_update
+    global state, score
     
     # Clear screen
     screen.brush = brushes.color(*BACKGROUND_COLOR)
@@ -134,6 +230,10 @@ def intro():
         w, _ = screen.measure_text(msg)
         screen.text(msg, 80 - (w // 2), 70)
     
+    controls = "B: Auto-play"
+    w, _ = screen.measure_text(controls)
+    screen.text(controls, 80 - (w // 2), 80)
+    
     # Draw some sample commits
     for i in range(3):
         x = 50 + i * 20
@@ -144,13 +244,21 @@ def intro():
     if io.BUTTON_A in io.pressed:
         state = GameState.PLAYING
         snake.reset()
-        commit.respawn()
+        autopilot.reset()
+        commit.respawn(snake.board)
         score = 0
+        clock.reset()
 
 def play():
-    global state, score, last_update
+    global state, score, auto_play
+    
+    # Toggle auto-play mode with B button
+    if io.BUTTON_B in io.pressed:
+        auto_play = not auto_play
+        autopilot.reset()
     
-    # Handle input
+    # Handle input - any direction press takes back control from auto-play
+    manual_input = True
     if io.BUTTON_A in io.pressed:
         snake.set_direction(-1, 0)  # Left
     elif io.BUTTON_C in io.pressed:
@@ -159,10 +267,20 @@ def play():
         snake.set_direction(0, -1)  # Up
     elif io.BUTTON_DOWN in io.pressed:
         snake.set_direction(0, 1)   # Down
+    else:
+        manual_input = False
+    if manual_input:
+        auto_play = False
     
-    # Update game logic
-    if io.ticks - last_update > update_interval:
-        last_update = io.ticks
+    commit_cell = commit.y * GRID_WIDTH + commit.x
+    if auto_play:
+        # Spread the path search over the frames between moves
+        autopilot.think(commit_cell, autopilot_budget)
+    
+    # Update game logic, one move per fixed step
+    for _ in range(clock.steps()):
+        if auto_play:
+            snake.set_direction(*autopilot.steer(commit_cell))
         
         # Update snake position
         if not snake.update():
@@ -170,18 +288,23 @@ def play():
             return
         
         # Check if snake ate the commit
-        head = snake.segments[0]
+        head = snake.head()
         if head[0] == commit.x and head[1] == commit.y:
             score += 1
             snake.grow()
-            commit.respawn()
-            # Make sure commit doesn't spawn on snake
-            while (commit.x, commit.y) in snake.segments:
-                commit.respawn()
+            # Sample straight from the free cells so the commit never lands on the snake
+            commit.respawn(snake.board)
+            commit_cell = commit.y * GRID_WIDTH + commit.x
     
     # Draw everything
-    commit.draw()
-    snake.draw()
+    grid.render()
+    
+    # Show green 'A' when in auto-play mode
+    if auto_play:
+        screen.font = small_font
+        screen.brush = brushes.color(*SNAKE_COLOR)
+        w, _ = screen.measure_text("A")
+        screen.text("A", 80 - (w // 2), 2)
     
 def game_over():
     global state
@@ -0,0 +1,327 @@
+"""Snake auto-pilot: BFS to the commit with a Hamiltonian cycle fallback.
+
+Planning is incremental - `think()` is called every frame and expands the
+current search until its time budget runs out, so the work is spread across
+the frames between snake moves. A found path is cached and followed until the
+commit moves or the path stops matching the snake. When there is no safe path
+(or planning has not finished by the time the snake has to move) the snake
+follows a Hamiltonian cycle of the board, taking shortcuts that never
+overtake its tail.
+
+All searches are time-aware: a body cell counts as free once the tail will
+have moved off it by the time the head gets there.
+"""
+import time
+from array import array
+
+# Stop using BFS once the snake covers 1/BFS_MAX_FILL of the board - from
+# then on only the cycle is safe enough
+BFS_MAX_FILL = 3
+
+NO_PARENT = 0xFFFF
+
+# Planning phases
+PHASE_PATH = 1  # searching for the commit
+PHASE_CHECK = 2  # checking the snake has room after eating
+PHASE_ESCAPE = 3  # no safe path, checking which next moves leave the snake room
+PHASE_DONE = 4  # finished, with or without a path
+
+
+class AutoPilot:
+    def __init__(self, snake, width, height):
+        self.snake = snake
+        self.width = width
+        self.height = height
+        self.cells = width * height
+
+        # BFS scratch space, reused for every search
+        self.queue = array("H", bytearray(self.cells * 2))
+        self.parent = array("H", bytearray(self.cells * 2))
+        self.depth = array("H", bytearray(self.cells * 2))
+        self.visited = bytearray((self.cells + 7) // 8)
+
+        self.order = self.build_cycle()
+        self.reset()
+
+    def reset(self):
+        self.path = None  # cached list of cells to walk, next step last
+        self.path_target = None
+        self.search = None  # (head cell, target cell, snake length) being planned for
+        self.phase = PHASE_DONE
+        self.candidate = None
+        self.escapes = []  # neighbours of the head still to check in PHASE_ESCAPE
+        self.safe = []  # neighbours of the head found to leave the snake room
+        self.virtual = None  # body offsets of planned cells while checking for room
+        self.pops = 0
+        self.virtual_grow = 0
+        self.target = None
+        self.q_head = 0
+        self.q_tail = 0
+
+    def build_cycle(self):
+        """Number every cell along a Hamiltonian cycle of the grid.
+
+        Rows are walked as a serpentine over columns 1.. and column 0 is the
+        lane back to the start, which closes the loop for an even row count.
+        """
+        w, h = self.width, self.height
+        order = array("H", bytearray(self.cells * 2))
+        i = 0
+        for y in range(h):
+            xs = range(1, w) if y % 2 == 0 else range(w - 1, 0, -1)
+            for x in xs:
+                order[y * w + x] = i
+                i += 1
+        for y in range(h - 1, -1, -1):
+            order[y * w] = i
+            i += 1
+        return order
+
+    def neighbours(self, cell):
+        w = self.width
+        x = cell % w
+        y = cell // w
+        return (
+            cell - 1 if x > 0 else cell + w - 1,
+            cell + 1 if x < w - 1 else cell - x,
+            cell - w if y > 0 else cell + (self.height - 1) * w,
+            cell + w if y < self.height - 1 else x,
+        )
+
+    def direction(self, a, b):
+        """Direction (dx, dy) of the move from cell a to its neighbour b"""
+        w = self.width
+        dx = (b % w - a % w) % w
+        dy = (b // w - a // w) % self.height
+        if dx:
+            return (1, 0) if dx == 1 else (-1, 0)
+        return (0, 1) if dy == 1 else (0, -1)
+
+    def blocked(self, cell, steps):
+        """True if the body still covers cell when the head arrives in `steps` moves"""
+        snake = self.snake
+        if self.virtual is not None:
+            # Checking the snake as it will be after walking a planned path
+            offset = self.virtual.get(cell)
+            if offset is None:
+                if not snake.board.occupied(cell):
+                    return False
+                offset = (snake.where[cell] - snake.tail) % self.cells - self.pops
+                if offset < 0:
+                    return False
+            return steps < self.virtual_grow + offset + 2
+
+        if not snake.board.occupied(cell):
+            return False
+        # the segment `offset` from the tail leaves after offset + 1 tail moves,
+        # which only start once the pending growth is used up
+        offset = (snake.where[cell] - snake.tail) % self.cells
+        return steps < snake.grow_pending + offset + 2
+
+    def in_body(self, cell):
+        """True if cell is part of the (virtual) snake body"""
+        if cell in self.virtual:
+            return True
+        if not self.snake.board.occupied(cell):
+            return False
+        return (self.snake.where[cell] - self.snake.tail) % self.cells >= self.pops
+
+    def start_search(self, start, target):
+        """Begin a BFS from start; target None means search for a way onto the body instead.
+
+        The head can only step onto a body cell once that segment has moved
+        off it, and from there it can follow the body round forever, so
+        reaching one proves the snake can't be boxed in.
+        """
+        for i in range(len(self.visited)):
+            self.visited[i] = 0
+        self.visited[start >> 3] |= 1 << (start & 7)
+        self.parent[start] = NO_PARENT
+        self.depth[start] = 0
+        self.queue[0] = start
+        self.q_head = 0
+        self.q_tail = 1
+        self.target = target
+
+    def expand(self, budget_ms):
+        """Run the current BFS for up to budget_ms.
+
+        Returns True when the target (or the body) was reached, False when the search is exhausted and None when out of time.
+        """
+        began = time.ticks_ms()
+        queue, parent, depth, visited = self.queue, self.parent, self.depth, self.visited
+        q_head, q_tail = self.q_head, self.q_tail
+        target = self.target
+        expanded = 0
+        while q_head < q_tail:
+            cell = queue[q_head]
+            q_head += 1
+            steps = depth[cell] + 1
+            for n in self.neighbours(cell):
+                if visited[n >> 3] & (1 << (n & 7)) or self.blocked(n, steps):
+                    continue
+                visited[n >> 3] |= 1 << (n & 7)
+                parent[n] = cell
+                depth[n] = steps
+                queue[q_tail] = n
+                q_tail += 1
+                if n == target or (target is None and self.in_body(n)):
+                    self.q_head, self.q_tail = q_head, q_tail
+                    return True
+
+            expanded += 1
+            if not expanded & 15 and time.ticks_diff(time.ticks_ms(), began) >= budget_ms:
+                self.q_head, self.q_tail = q_head, q_tail
+                return None
+
+        self.q_head, self.q_tail = q_head, q_tail
+        return False
+
+    def think(self, target, budget_ms=4):
+        """Spend up to budget_ms planning a safe path to target.
+
+        A path found by BFS is only used if a second search from the commit
+        shows the snake will still have room to move after eating. Without a
+        safe path, each possible next move is checked the same way so the
+        cycle fallback can avoid the ones that box the snake in.
+        """
+        snake = self.snake
+        key = (snake.head_cell(), target, snake.length)
+        if self.path is not None and self.path_target == target:
+            return
+        if self.search != key:
+            self.search = key
+            self.path = None
+            self.virtual = None
+            self.safe = []
+            if snake.length * BFS_MAX_FILL > self.cells:
+                # Too long to chase the commit, just keep the cycle moves safe
+                self.start_escape(target)
+            else:
+                self.phase = PHASE_PATH
+                self.start_search(key[0], target)
+
+        if self.phase == PHASE_PATH:
+            result = self.expand(budget_ms)
+            if result is None:
+                return
+            if result:
+                self.candidate = self.trace(target)
+                self.check(self.candidate, True)
+                self.phase = PHASE_CHECK
+            else:
+                self.start_escape(target)
+
+        if self.phase == PHASE_CHECK:
+            result = self.expand(budget_ms)
+            if result is None:
+                return
+            if result:
+                self.path = self.candidate
+                self.path_target = target
+                self.virtual = None
+                self.phase = PHASE_DONE
+            else:
+                self.start_escape(target)
+
+        while self.phase == PHASE_ESCAPE:
+            result = self.expand(budget_ms)
+            if result is None:
+                return
+            cell = self.escapes.pop()
+            if result:
+                self.safe.append(cell)
+            self.next_escape(target)
+
+    def trace(self, target):
+        """Walk the BFS parents back from target, returning the path with the first step last"""
+        path = []
+        cell = target
+        while self.parent[cell] != NO_PARENT:
+            path.append(cell)
+            cell = self.parent[cell]
+        return path
+
+    def check(self, path, eats):
+        """Start checking the snake can't get boxed in after walking path (first step last)"""
+        snake = self.snake
+        steps = len(path)
+        self.pops = max(0, steps - snake.grow_pending)
+        self.virtual_grow = max(0, snake.grow_pending - steps) + (1 if eats else 0)
+        base = snake.length - self.pops
+        self.virtual = {}
+        for j in range(steps):
+            self.virtual[path[steps - 1 - j]] = base + j
+        self.start_search(path[0], None)
+
+    def start_escape(self, target):
+        """No safe path to the commit - find out which next moves keep the snake alive"""
+        self.candidate = None
+        self.virtual = None
+        self.phase = PHASE_ESCAPE
+        head = self.snake.head_cell()
+        self.escapes = [n for n in self.neighbours(head) if not self.blocked(n, 1)]
+        self.next_escape(target)
+
+    def next_escape(self, target):
+        if self.escapes:
+            cell = self.escapes[-1]
+            self.check([cell], cell == target)
+        else:
+            self.virtual = None
+            self.phase = PHASE_DONE
+
+    def steer(self, target):
+        """Return the direction for the snake's next move towards target"""
+        head = self.snake.head_cell()
+
+        # Follow the cached path while it still leads from the head to the commit
+        path = self.path
+        if path and self.path_target == target and path[-1] in self.neighbours(head):
+            return self.direction(head, path.pop())
+
+        # No path yet: drop any stale result and ride the cycle for this move
+        self.path = None
+        return self.direction(head, self.cycle_move(head, target))
+
+    def cycle_move(self, head, target):
+        """Next cell along the Hamiltonian cycle, skipping ahead when it is safe"""
+        snake, order, cells = self.snake, self.order, self.cells
+        h = order[head]
+        to_tail = (order[snake.body[snake.tail]] - h) % cells
+        to_food = (order[target] - h) % cells
+        # leave room for the growth still to come before the tail moves again
+        room = to_tail - snake.grow_pending - 2
+
+        # Once the escape check has run, only consider moves that leave room
+        candidates = self.neighbours(head)
+        if self.safe and self.search == (head, target, snake.length):
+            candidates = self.safe
+
+        best, best_d = None, 0
+        for n in candidates:
+            if snake.board.occupied(n):
+                continue
+            d = (order[n] - h) % cells
+            if d == 1:
+                # the plain cycle step is always allowed
+                shortcut_ok = True
+            else:
+                shortcut_ok = d < room and d <= to_food and snake.length * 2 < cells
+            if shortcut_ok and d > best_d:
+                best, best_d = n, d
+
+        if best is None:
+            # Off the cycle with nothing safe - take the free cell furthest along it
+            for n in candidates:
+                if not snake.board.occupied(n):
+                    d = (order[n] - h) % cells
+                    if d > best_d:
+                        best, best_d = n, d
+
+        if best is None:
+            # Boxed in, keep going and let the collision end the game
+            dx, dy = snake.direction
+            x, y = head % self.width, head // self.width
+            return ((y + dy) % self.height) * self.width + (x + dx) % self.width
+        return best
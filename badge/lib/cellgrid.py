@@ -0,0 +1,79 @@
+"""Palette-indexed renderer for the grid games (life, snake, commits).
+
+Apps keep one palette index per cell in `grid.cells` instead of drawing
+squares. The grid mirrors them into a small image with one pixel per cell,
+blits it to the screen scaled up in a single `scale_blit`, then blits a
+mask that paints the gaps between cells. Only cells that changed are
+written to the small image, so a frame costs the same however many cells
+are lit.
+"""
+from badgeware import Image, brushes, shapes, screen
+
+
+class CellGrid:
+    def __init__(self, width, height, palette, cell_size=4, gap=1):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.cells = bytearray(width * height)  # palette index per cell, y * width + x
+        self.shown = bytearray(width * height)  # indices currently in the layer
+        self.dirty = bytearray(height)  # rows written since the last render
+
+        # Pre-create brushes for performance
+        self.brushes = [brushes.color(*color) for color in palette]
+
+        # One pixel per cell, filled with palette entry 0
+        self.layer = Image(0, 0, width, height)
+        self.layer.brush = self.brushes[0]
+        self.layer.draw(shapes.rectangle(0, 0, width, height))
+
+        # Transparent except for the gap along the right and bottom of each cell
+        self.mask = None
+        if gap:
+            w, h = width * cell_size, height * cell_size
+            self.mask = Image(0, 0, w, h)
+            self.mask.brush = self.brushes[0]
+            for x in range(width):
+                self.mask.draw(shapes.rectangle((x + 1) * cell_size - gap, 0, gap, h))
+            for y in range(height):
+                self.mask.draw(shapes.rectangle(0, (y + 1) * cell_size - gap, w, gap))
+
+    def set(self, cell, index):
+        if self.cells[cell] != index:
+            self.cells[cell] = index
+            self.dirty[cell // self.width] = 1
+
+    def fill(self, index=0):
+        cells = self.cells
+        for i in range(len(cells)):
+            cells[i] = index
+        self.invalidate()
+
+    def invalidate(self):
+        """Check every cell on the next render, after writing to `cells` directly"""
+        dirty = self.dirty
+        for y in range(self.height):
+            dirty[y] = 1
+
+    def sync(self):
+        """Write the cells that changed since the last render into the layer"""
+        cells, shown, dirty = self.cells, self.shown, self.dirty
+        layer, palette, width = self.layer, self.brushes, self.width
+        for y in range(self.height):
+            if not dirty[y]:
+                continue
+            dirty[y] = 0
+            row = y * width
+            for x in range(width):
+                index = cells[row + x]
+                if index != shown[row + x]:
+                    shown[row + x] = index
+                    layer.brush = palette[index]
+                    layer.draw(shapes.rectangle(x, y, 1, 1))
+
+    def render(self, x=0, y=0):
+        self.sync()
+        size = self.cell_size
+        screen.scale_blit(self.layer, x, y, self.width * size, self.height * size)
+        if self.mask:
+            screen.blit(self.mask, x, y)
@@ -0,0 +1,68 @@
+"""Fixed-timestep scheduling for the badge games.
+
+`badgeware.run` calls an app's update() once per rendered frame, however long
+that frame took. A FixedStep turns the time since the last frame into a whole
+number of logic steps at a fixed rate, so game speed and physics don't depend
+on the frame rate: a slow frame runs several steps, a fast one may run none.
+The fraction of a step left over is kept as `alpha` for interpolating what is
+drawn between the last two steps.
+
+At most `max_steps` run per frame and any time beyond that is dropped, so one
+heavy frame can't snowball into ever longer catch-up (the spiral of death).
+
+Games whose logic was written to move a fixed amount per rendered frame step
+at TUNED_HZ, so they keep the speed they had when they ran once per frame.
+"""
+from badgeware import io
+
+# the frame rate the per-frame games (flappy, commits) were written against.
+# nothing in the tree records it and it hasn't been measured on a badge, 30
+# is the rate flappy's obstacle pool is sized for (a pipe every 1.5 seconds
+# at a pixel a frame is 45px apart). both games share it, so timing the old
+# per-frame loop on hardware and correcting it here changes them together
+TUNED_HZ = 30
+
+
+class FixedStep:
+    def __init__(self, hz, max_steps=4):
+        self.step_ms = 1000 / hz
+        self.dt = 1 / hz  # seconds per step, for physics
+        self.max_steps = max_steps
+        self.time = 0  # milliseconds of game time stepped so far
+        self.reset()
+
+    def reset(self):
+        """Start timing afresh, e.g. when a game starts or comes back from a pause"""
+        self.last = None
+        self.accumulator = 0
+        self.alpha = 0
+
+    def steps(self):
+        """Return the number of logic steps due this frame"""
+        now = io.ticks
+        if self.last is None:
+            self.last = now
+        self.accumulator += now - self.last
+        self.last = now
+
+        count = int(self.accumulator // self.step_ms)
+        if count > self.max_steps:
+            # Too far behind, drop the backlog rather than trying to catch up
+            count = self.max_steps
+            self.accumulator = count * self.step_ms
+        self.accumulator -= count * self.step_ms
+        self.alpha = self.accumulator / self.step_ms
+        self.time += count * self.step_ms
+        return count
+
+    def update(self, step, draw=None):
+        """Run the due steps, then draw(alpha) once"""
+        for _ in range(self.steps()):
+            step()
+        if draw:
+            draw(self.alpha)
+
+
+def lerp(a, b, alpha):
+    """Interpolate from a (previous step) to b (latest step)"""
+    return a + (b - a) * alpha
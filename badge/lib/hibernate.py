@@ -0,0 +1,55 @@
+"""Timed deep sleep that wakes back into the app that asked for it.
+
+`sleep(app, ms)` powers the badge down for ms milliseconds. Waking from deep
+sleep restarts the badge, so the app's path is written to RESUME_FILE first
+and main.py starts that app directly instead of showing the menu. The app
+can check `woken` to tell a timed wake (do a little work and go back to
+sleep) from being launched by the user.
+
+RESUME_FILE is removed on every boot, so pressing Reset while the badge is
+asleep starts it normally and the request can't linger to a later boot.
+Quitting to the menu also comes back through the watchdog, so main.py calls
+`cancel()` before that reset.
+"""
+import os
+import machine
+
+RESUME_FILE = "/hibernate"
+
+# the app path when the badge was started by waking from sleep, else None
+woken = None
+
+
+def sleep(app, ms):
+    """Deep sleep for ms milliseconds, then restart into app"""
+    with open(RESUME_FILE, "w") as f:
+        f.write(app)
+    machine.deepsleep(ms)
+
+
+def cancel():
+    """Forget any pending resume, e.g. before resetting back to the menu"""
+    try:
+        os.remove(RESUME_FILE)
+    except OSError:
+        pass
+
+
+def resume(watchdog):
+    """Return the app to restart into after a wake from sleep, or None
+
+    Called once by main.py on every boot, watchdog says whether the boot came
+    through the watchdog as a wake from sleep does. The request is removed
+    either way so it only ever applies to the boot straight after the sleep.
+    """
+    global woken
+    try:
+        with open(RESUME_FILE, "r") as f:
+            app = f.read()
+    except OSError:
+        return None
+    cancel()
+    if not watchdog or not app:
+        return None
+    woken = app
+    return app
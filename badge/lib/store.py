@@ -0,0 +1,220 @@
+"""Buffered app state, saved to flash in the background of the frame loop.
+
+`State.save` writes JSON to flash there and then, which can stall a frame
+for tens of milliseconds. A Store keeps the values in memory and notes which
+keys changed. `update()` is called every frame and only writes once
+something has been dirty for `delay` ms, and only on an idle frame, unless
+the write has been put off for `max_delay`. Any number of changes in
+between cost a single write. Call `flush()` before the app exits.
+
+    store = Store("quest", {"completed": []})
+    store.load()
+    ...
+    store["completed"].append(id)
+    store.changed("completed")  # after changing a value in place
+    ...
+    store.update(idle=not io.held)  # every frame
+
+Values are None, bools, ints, floats, strings, bytes or lists of those,
+packed into a small binary record with a sequence number and checksum. The
+record goes to two slot files in turn, each written to a temporary file and
+renamed over the slot so it is never half written. Loading takes the newest
+valid slot, so a write cut short by a flat battery falls back to the one
+before. A store with no saved record yet picks up the app's old `State`
+file.
+"""
+import os
+import struct
+from badgeware import io, State
+
+STORE_DIR = "/state"
+MAGIC = b"ST1"
+HEADER = "<3sHHH"  # magic, sequence, payload length, checksum
+HEADER_SIZE = struct.calcsize(HEADER)
+
+
+def checksum(data):
+    # fletcher-16
+    a = b = 0
+    for byte in data:
+        a = (a + byte) % 255
+        b = (b + a) % 255
+    return (b << 8) | a
+
+
+def encode_value(out, value):
+    if value is None:
+        out.append(b"n")
+    elif value is True or value is False:
+        out.append(b"t" if value else b"f")
+    elif isinstance(value, int):
+        if -0x80000000 <= value < 0x80000000:
+            out.append(b"i" + struct.pack("<i", value))
+        else:
+            out.append(b"q" + struct.pack("<q", value))
+    elif isinstance(value, float):
+        out.append(b"d" + struct.pack("<d", value))
+    elif isinstance(value, str):
+        data = value.encode()
+        out.append(b"s" + struct.pack("<H", len(data)) + data)
+    elif isinstance(value, (bytes, bytearray)):
+        out.append(b"b" + struct.pack("<H", len(value)) + bytes(value))
+    elif isinstance(value, (list, tuple)):
+        out.append(b"l" + struct.pack("<H", len(value)))
+        for item in value:
+            encode_value(out, item)
+    else:
+        raise TypeError("can't store " + type(value).__name__)
+
+
+def decode_value(data, i):
+    # returns the value at data[i] and the index after it
+    tag = data[i]
+    i += 1
+    if tag == 0x6E:  # n
+        return None, i
+    if tag == 0x74:  # t
+        return True, i
+    if tag == 0x66:  # f
+        return False, i
+    if tag == 0x69:  # i
+        return struct.unpack_from("<i", data, i)[0], i + 4
+    if tag == 0x71:  # q
+        return struct.unpack_from("<q", data, i)[0], i + 8
+    if tag == 0x64:  # d
+        return struct.unpack_from("<d", data, i)[0], i + 8
+    if tag == 0x73 or tag == 0x62:  # s, b
+        length = struct.unpack_from("<H", data, i)[0]
+        value = bytes(data[i + 2:i + 2 + length])
+        return (value.decode() if tag == 0x73 else value), i + 2 + length
+    if tag == 0x6C:  # l
+        count = struct.unpack_from("<H", data, i)[0]
+        i += 2
+        items = []
+        for _ in range(count):
+            item, i = decode_value(data, i)
+            items.append(item)
+        return items, i
+    raise ValueError("bad tag")
+
+
+def encode(values):
+    out = []
+    for key, value in values.items():
+        name = key.encode()
+        out.append(struct.pack("<B", len(name)) + name)
+        encode_value(out, value)
+    return b"".join(out)
+
+
+def decode(data):
+    values = {}
+    i = 0
+    while i < len(data):
+        length = data[i]
+        key = bytes(data[i + 1:i + 1 + length]).decode()
+        values[key], i = decode_value(data, i + 1 + length)
+    return values
+
+
+class Store:
+    def __init__(self, name, defaults, delay=2000, max_delay=10000):
+        self.name = name
+        self.data = dict(defaults)
+        self.delay = delay
+        self.max_delay = max_delay
+        self.dirty = set()
+        self.dirty_since = None
+        self.sequence = 0
+        self.slot = 0  # slot the next record goes to
+
+    def path(self, slot):
+        return f"{STORE_DIR}/{self.name}.{slot}.bin"
+
+    def read_slot(self, slot):
+        # returns (sequence, values) or None if the slot is missing or damaged
+        try:
+            with open(self.path(slot), "rb") as f:
+                data = f.read()
+            magic, sequence, length, check = struct.unpack_from(HEADER, data)
+            payload = memoryview(data)[HEADER_SIZE:HEADER_SIZE + length]
+            if magic != MAGIC or len(payload) != length or checksum(payload) != check:
+                return None
+            return sequence, decode(payload)
+        except (OSError, ValueError, IndexError, UnicodeError):
+            return None
+
+    def load(self):
+        """Load the saved values over the defaults, returns false if there were none"""
+        records = [self.read_slot(0), self.read_slot(1)]
+        newest = None
+        for slot in (0, 1):
+            record = records[slot]
+            if record is None:
+                continue
+            # sequence numbers wrap, newer is up to half the range ahead
+            if newest is None or (record[0] - records[newest][0]) & 0xFFFF < 0x8000:
+                newest = slot
+
+        self.dirty = set()
+        self.dirty_since = None
+        if newest is None:
+            return State.load(self.name, self.data)
+
+        sequence, values = records[newest]
+        self.data.update(values)
+        self.sequence = sequence
+        self.slot = 1 - newest
+        return True
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        if self.data.get(key) != value or key not in self.data:
+            self.data[key] = value
+            self.changed(key)
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def changed(self, key):
+        """Mark key as needing saving, e.g. after changing a list in place"""
+        if not self.dirty:
+            self.dirty_since = io.ticks
+        self.dirty.add(key)
+
+    def update(self, idle=True):
+        """Call every frame: saves once changes have settled, on an idle frame"""
+        if not self.dirty:
+            return
+        waited = io.ticks - self.dirty_since
+        if waited >= self.max_delay or (idle and waited >= self.delay):
+            self.flush()
+
+    def flush(self):
+        """Save any changes now"""
+        if not self.dirty:
+            return
+        self.sequence = (self.sequence + 1) & 0xFFFF
+        payload = encode(self.data)
+        header = struct.pack(HEADER, MAGIC, self.sequence, len(payload), checksum(payload))
+
+        try:
+            os.mkdir(STORE_DIR)
+        except OSError:
+            pass
+        temp = f"{STORE_DIR}/{self.name}.tmp"
+        with open(temp, "wb") as f:
+            f.write(header)
+            f.write(payload)
+        try:
+            os.rename(temp, self.path(self.slot))
+        except OSError:
+            # FAT can't rename over an existing file
+            os.remove(self.path(self.slot))
+            os.rename(temp, self.path(self.slot))
+
+        self.slot = 1 - self.slot
+        self.dirty = set()
+        self.dirty_since = None
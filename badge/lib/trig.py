@@ -0,0 +1,75 @@
+"""Table-driven sin and cos for per-frame animation.
+
+Angles are integer steps, STEPS to a full turn, so a lookup is an index into
+a table built once at import instead of a float `math.sin` call. Results come
+as floats in -1..1 (`sin`, `cos`) or fixed point with ONE as 1.0 (`sin_fx`,
+`cos_fx`) for integer-only drawing maths.
+
+Most animations are `math.sin(io.ticks / k)`: a wave with a period of 2*pi*k
+milliseconds. `period(k)` gives that period once, and `wave`, `pulse` and
+`angle` turn a time in milliseconds into the table lookup with integer maths
+only:
+
+    BLINK = trig.period(250)  # at import, same speed as sin(io.ticks / 250)
+    ...
+    brightness = trig.pulse(io.ticks, BLINK) * 255
+
+The tables have 1.4 degree steps, plenty for shapes a few dozen pixels across.
+"""
+import math
+from array import array
+
+STEPS = 256  # table steps in a full turn
+MASK = STEPS - 1
+QUARTER = STEPS // 4
+ONE = 1 << 14  # fixed point 1.0
+
+SIN = [math.sin(i * 2 * math.pi / STEPS) for i in range(STEPS)]
+SIN_FX = array("h", [round(s * ONE) for s in SIN])
+PULSE = [(s + 1) / 2 for s in SIN]
+
+
+def sin(i):
+    return SIN[i & MASK]
+
+
+def cos(i):
+    return SIN[(i + QUARTER) & MASK]
+
+
+def sin_fx(i):
+    return SIN_FX[i & MASK]
+
+
+def cos_fx(i):
+    return SIN_FX[(i + QUARTER) & MASK]
+
+
+def degrees(deg):
+    """Table steps for an angle in degrees"""
+    return round(deg * STEPS / 360)
+
+
+def radians(rad):
+    """Table steps for an angle in radians"""
+    return round(rad * STEPS / (2 * math.pi))
+
+
+def period(k):
+    """Milliseconds per cycle of math.sin(ticks / k)"""
+    return round(2 * math.pi * k)
+
+
+def angle(t, period):
+    """Table steps t milliseconds into a cycle lasting period milliseconds"""
+    return t % period * STEPS // period
+
+
+def wave(t, period, phase=0):
+    """sin at time t of a wave lasting period milliseconds, in -1..1"""
+    return SIN[(t % period * STEPS // period + phase) & MASK]
+
+
+def pulse(t, period, phase=0):
+    """Like wave but in 0..1, for brightness and other throbbing effects"""
+    return PULSE[(t % period * STEPS // period + phase) & MASK]
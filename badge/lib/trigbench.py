@@ -0,0 +1,84 @@
+"""Compare trig.py table lookups with the math module.
+
+Times the same workloads the apps run each frame, using math.sin/math.cos
+and then the trig tables. Copy it to the badge next to trig.py and run it
+there (or on the host, for a rough idea):
+
+    mpremote run badge/lib/trigbench.py
+    python badge/lib/trigbench.py [loops]
+
+Reports microseconds per loop for each workload.
+"""
+import sys
+import time
+import math
+
+sys.path.append("/system/lib")
+
+import trig
+
+BLINK = trig.period(250)
+
+
+def ticks_us():
+    # MicroPython has ticks_us, CPython has perf_counter
+    if hasattr(time, "ticks_us"):
+        return time.ticks_us()
+    return int(time.perf_counter() * 1000000)
+
+
+def dial_math(t):
+    # sketch's dial: 20 ticks, inner and outer point of each
+    total = 0
+    for i in range(20):
+        r = (t + i * 18) * (math.pi / 180.0)
+        total += math.sin(r) * 16 + math.cos(r) * 16 + math.sin(r) * 13 + math.cos(r) * 13
+    return total
+
+
+def dial_table(t):
+    total = 0
+    base = trig.degrees(t)
+    for i in range(20):
+        a = base + i * trig.STEPS // 20
+        s, c = trig.sin(a), trig.cos(a)
+        total += s * 16 + c * 16 + s * 13 + c * 13
+    return total
+
+
+def dial_fixed(t):
+    total = 0
+    base = trig.degrees(t)
+    for i in range(20):
+        a = base + i * trig.STEPS // 20
+        s, c = trig.sin_fx(a), trig.cos_fx(a)
+        total += (s * 16 + c * 16 + s * 13 + c * 13) >> 14
+    return total
+
+
+def pulse_math(t):
+    return (math.sin(t / 250) * 127) + 127
+
+
+def pulse_table(t):
+    return trig.pulse(t, BLINK) * 254
+
+
+def bench(name, fn, loops):
+    start = ticks_us()
+    for t in range(loops):
+        fn(t)
+    elapsed = ticks_us() - start
+    print(f"{name:<14} {elapsed / loops:8.2f} us")
+
+
+def main(loops=2000):
+    bench("dial math", dial_math, loops)
+    bench("dial table", dial_table, loops)
+    bench("dial fixed", dial_fixed, loops)
+    bench("pulse math", pulse_math, loops)
+    bench("pulse table", pulse_table, loops)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
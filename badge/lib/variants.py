@@ -0,0 +1,60 @@
+"""Cache of flipped, scaled and faded copies of sprite frames.
+
+Drawing a sprite mirrored, squashed into a reflection or faded out takes a
+`scale_blit` with negative sizes and an `alpha` change on the shared frame
+every time it's drawn. A VariantCache renders each combination once into its
+own image (with its alpha already set), so drawing it is a plain `blit`:
+
+    variants = VariantCache(32 * 1024)
+    ...
+    image = variants.get(("dance", i), mona.frame(i), -28, 24)
+    screen.blit(image, x, y)
+
+Keys name the frame, since the sprite objects themselves may not be reused.
+Variants are kept while they fit in the byte budget, least recently used
+ones are dropped to make room.
+"""
+from badgeware import Image
+
+
+class VariantCache:
+    def __init__(self, budget):
+        self.budget = budget
+        self.used = 0
+        self.entries = {}  # (key, width, height, alpha) -> [image, last used]
+        self.clock = 0
+
+    def get(self, key, source, width, height, alpha=255):
+        """source drawn at width x height (negative flips it) and alpha"""
+        key = (key, width, height, alpha)
+        self.clock += 1
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = [self.render(source, width, height, alpha), 0]
+            self.make_room(self.size(entry[0]))
+            self.entries[key] = entry
+            self.used += self.size(entry[0])
+        entry[1] = self.clock
+        return entry[0]
+
+    def render(self, source, width, height, alpha):
+        image = Image(0, 0, abs(width), abs(height))
+        image.scale_blit(source, 0, 0, width, height)
+        image.alpha = alpha
+        return image
+
+    def size(self, image):
+        return image.width * image.height * 4
+
+    def make_room(self, size):
+        entries = self.entries
+        while entries and self.used + size > self.budget:
+            oldest, stamp = None, None
+            for key, entry in entries.items():
+                if stamp is None or entry[1] < stamp:
+                    oldest, stamp = key, entry[1]
+            self.used -= self.size(entries.pop(oldest)[0])
+
+    def clear(self):
+        self.entries = {}
+        self.used = 0
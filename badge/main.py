@@ -7,8 +7,14 @@ import machine
 import gc
 import powman
 
+sys.path.append("/system/lib")
+import hibernate
+
 SKIP_CINEMATIC = powman.get_wake_reason() == powman.WAKE_WATCHDOG
 
+# an app that put the badge to sleep is started again without the menu
+resume_app = hibernate.resume(SKIP_CINEMATIC)
+
 running_app = None
 
 
@@ -18,6 +24,8 @@ def quit_to_launcher(pin):
     # If we reset while boot is low, bad times
     while not pin.value():
         pass
+    # this reset comes back through the watchdog too, it mustn't resume
+    hibernate.cancel()
     machine.reset()
 
 
@@ -33,20 +41,23 @@ if not SKIP_CINEMATIC:
 
     gc.collect()
 
-menu = __import__("/system/apps/menu")
+if resume_app:
+    app = resume_app
+else:
+    menu = __import__("/system/apps/menu")
 
-app = run(menu.update)
+    app = run(menu.update)
 
-if sys.path[0].startswith("/system/apps"):
-    sys.path.pop(0)
+    if sys.path[0].startswith("/system/apps"):
+        sys.path.pop(0)
 
-del menu
+    del menu
 
-# make sure these can be re-imported by the app
-del sys.modules["ui"]
-del sys.modules["icon"]
+    # make sure these can be re-imported by the app
+    del sys.modules["ui"]
+    del sys.modules["icon"]
 
-gc.collect()
+    gc.collect()
 
 # Don't pass the b press into the app
 while io.held:
@@ -9,7 +9,7 @@ from ..pulse.receive import PulseReceiver, DEFAULT_FILTER_THRESHOLD
 from .common import pulse_us_valid, NEC_REPEAT, NEC_REPEAT_TIMEOUT_MS, \
                     NEC_START_BURST_US, NEC_START_REPEAT_US, NEC_START_DATA_US, \
                     NEC_DATA_BURST_US, NEC_DATA_ZERO_US, NEC_DATA_ONE_US
-from .remotes import KNOWN_REMOTES
+from .remotes import known_remotes
 
 
 class NECReceiver(PulseReceiver):
@@ -35,6 +35,15 @@ class NECReceiver(PulseReceiver):
         else:
             self.__remotes[addr] = [remote_descriptor]
 
+    def unbind(self, remote_descriptor):
+        addr = remote_descriptor.ADDRESS
+        remotes = self.__remotes.get(addr)
+        if remotes is None or remote_descriptor not in remotes:
+            raise ValueError(f"The remote '{remote_descriptor.NAME}' is not bound")
+        remotes.remove(remote_descriptor)
+        if len(remotes) == 0:
+            del self.__remotes[addr]
+
     def reset(self):
         self.__last_code = NEC_REPEAT
         self.__last_rx = time.ticks_ms()
@@ -161,55 +170,51 @@ class NECReceiver(PulseReceiver):
                 return
 
             # Does the address match one of the bound remotes?
-            if addr in self.__remotes:
+            remotes = self.__remotes.get(addr)
+            if remotes is not None:
                 # Go through all the bound remotes with the address
                 known = False
-                for remote in self.__remotes[addr]:
+                for remote in remotes:
                     # Perform the general callback for any command received
                     if remote.on_any is not None:
                         remote.on_any(cmd)
 
                     # Perform the callback only for known commands that are received
                     if remote.on_known is not None:
-                        for key, val in remote.BUTTON_CODES.items():
-                            if val == cmd:
-                                remote.on_known(key)
-                                break
+                        keys = remote.names_of(cmd)
+                        if keys:
+                            remote.on_known(keys[0])
 
-                    try:
-                        # Attempt to get the button associated with the command
-                        # Raises a KeyError if it fails
-                        button = remote.button(cmd)
+                    # Get the button associated with the command, if any
+                    button = remote.find_button(cmd)
+                    if button is None:
+                        continue
 
-                        # At least one bound remote has this button
-                        known = True
+                    # At least one bound remote has this button
+                    known = True
 
-                        if debug:
-                            for key, val in remote.BUTTON_CODES.items():
-                                if val == cmd:
-                                    print(f"'{key}' (0x{cmd:02x}) received from bound remote `{remote.NAME}` (0x{addr:02x})")
-
-                        # Perform the press action of the bound button, if present
-                        if button.on_press is not None:
-                            button.on_press()
+                    if debug:
+                        for key in remote.names_of(cmd):
+                            print(f"'{key}' (0x{cmd:02x}) received from bound remote `{remote.NAME}` (0x{addr:02x})")
 
-                        # Queue up the repeat action of the bound button, if present
-                        if button.on_repeat is not None:
-                            self.__repeat_callbacks.append(button.on_repeat)
+                    # Perform the press action of the bound button, if present
+                    if button.on_press is not None:
+                        button.on_press()
 
-                        # Queue up the release action of the bound button, if present
-                        if button.on_release is not None:
-                            self.__release_callbacks.append(button.on_release)
+                    # Queue up the repeat action of the bound button, if present
+                    if button.on_repeat is not None:
+                        self.__repeat_callbacks.append(button.on_repeat)
 
-                    except KeyError:
-                        pass
+                    # Queue up the release action of the bound button, if present
+                    if button.on_release is not None:
+                        self.__release_callbacks.append(button.on_release)
 
                 # None of the bound remotes had a button binding for the command
                 if not known and debug:
-                    for remote in self.__remotes[addr]:
+                    for remote in remotes:
                         print(f"Unknown command (0x{cmd:02x}) received from bound remote `{remote.NAME}` (0x{addr:02x}). ", end="")
 
-                        keys = [key for key, val in remote.BUTTON_CODES.items() if val == cmd]
+                        keys = remote.names_of(cmd)
                         if len(keys) == 1:
                             print(f"Likely '{keys[0]}'")
                         else:
@@ -220,15 +225,14 @@ class NECReceiver(PulseReceiver):
                 print(f"Unknown code (Addr 0x{addr:02x}, Cmd 0x{cmd:02x}) received. ", end="")
 
                 known = False
-                for remote in KNOWN_REMOTES:
-                    if remote.ADDRESS == addr:
-                        print(", or " if known else "Likely from ", end="")
-
-                        known = True
-                        keys = [key for key, val in remote.BUTTON_CODES.items() if val == cmd]
-                        if len(keys) == 1:
-                            print(f"'{remote.NAME}.{keys[0]}'", end="")
-                        else:
-                            print(f"'{remote.NAME}' remote", end="")
+                for remote in known_remotes(addr):
+                    print(", or " if known else "Likely from ", end="")
+
+                    known = True
+                    keys = remote.names_of(cmd)
+                    if len(keys) == 1:
+                        print(f"'{remote.NAME}.{keys[0]}'", end="")
+                    else:
+                        print(f"'{remote.NAME}' remote", end="")
 
                 print("" if known else "No known remote")
@@ -3,3 +3,17 @@
 # SPDX-License-Identifier: MIT
 
 KNOWN_REMOTES = []
+
+# KNOWN_REMOTES indexed by address, rebuilt when remotes are added
+_by_address = {}
+_indexed = None
+
+
+def known_remotes(address):
+    global _by_address, _indexed
+    if _indexed != len(KNOWN_REMOTES):
+        _by_address = {}
+        for remote in KNOWN_REMOTES:
+            _by_address.setdefault(remote.ADDRESS, []).append(remote)
+        _indexed = len(KNOWN_REMOTES)
+    return _by_address.get(address, ())
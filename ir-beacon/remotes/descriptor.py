@@ -12,6 +12,11 @@ class RemoteDescriptor:
     ADDRESS = 0x00
     BUTTON_CODES = {}
 
+    # BUTTON_CODES reversed (code -> tuple of names), rebuilt when a class's
+    # BUTTON_CODES is replaced or gains entries
+    __code_names = None
+    __code_names_key = None
+
     def __init__(self):
         self.__buttons = {}
         self.on_known = None
@@ -41,3 +46,27 @@ class RemoteDescriptor:
 
     def button(self, code):
         return self.__buttons[code]
+
+    def find_button(self, code):
+        return self.__buttons.get(code)
+
+    @classmethod
+    def code_names(cls):
+        codes = cls.BUTTON_CODES
+        key = (id(codes), len(codes))
+        if cls.__code_names_key != key:
+            names = {}
+            for name, code in codes.items():
+                names[code] = names.get(code, ()) + (name,)
+            cls.__code_names = names
+            cls.__code_names_key = key
+        return cls.__code_names
+
+    @classmethod
+    def refresh_code_names(cls):
+        # Call after changing an existing entry of BUTTON_CODES in place
+        cls.__code_names_key = None
+
+    @classmethod
+    def names_of(cls, code):
+        return cls.code_names().get(code, ())